@@ -0,0 +1,44 @@
+# %% Comment extraction benchmark
+# Measures the throughput of Comment.extract_comments, in MB/s, on a generated file of several MB with line comments, block comments and strings.
+# Run from the root of the repository: python benchmarks/comments.py
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from clindoc.comment import Comment
+
+# Number of repetitions of the pattern below, about 12 MB
+REPEAT = 50000
+RUNS = 5
+# Smallest accepted throughput, in MB/s
+MIN_THROUGHPUT = 1.0
+
+PATTERN = '''%- Line comment on the rule below
+p(X,Y) :- q(X), r(Y), X != Y. % trailing comment
+%* Block comment
+   on several lines, with a % inside *%
+label("100% not a comment", "escaped \\" quote %").
+%@predicate(p/2,p(X,Y)) -> Directive comment
+'''
+# Comments of one pattern: 3 line comments, 1 block comment
+COMMENTS = 4
+
+file = (PATTERN * REPEAT).splitlines(keepends=True)
+size = sum(len(line) for line in file) / 1e6
+
+durations = []
+for _ in range(RUNS):
+    start = time.perf_counter()
+    comments = Comment.extract_comments(file, 'bench.lp')
+    durations.append(time.perf_counter() - start)
+    assert len(comments) == COMMENTS * REPEAT, f'{len(comments)} comments found instead of {COMMENTS * REPEAT}'
+
+median = statistics.median(durations)
+throughput = size / median
+print(f'{size:.1f} MB, {len(comments)} comments: {median * 1000:.0f} ms (median of {RUNS} runs), {throughput:.1f} MB/s')
+assert throughput > MIN_THROUGHPUT, f'comment extraction is slower than {MIN_THROUGHPUT} MB/s'
+print()
@@ -0,0 +1,55 @@
+# %% Memory benchmark
+# Measures the memory used to analyze a generated LP file of 10k rules: the peak of the Python allocations (tracemalloc) and the peak RSS.
+# Each measure runs in a fresh interpreter, tracemalloc slowing down the analysis and taking memory itself.
+# Run from the root of the repository: python benchmarks/memory.py
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+RULES = 10000
+# Largest accepted peak RSS increase, in MB
+BUDGET = 500
+
+# The child analyzes the folder and prints the peak memory used by the analysis, in MB
+CHILD = '''
+import resource, sys, tracemalloc
+from clindoc import Clindoc
+# Imported before the measure, so that its import is not counted
+import clingo
+parameters = Clindoc({'src_dir': sys.argv[1], 'no_cache': True}).parameters
+if sys.argv[2] == 'tracemalloc':
+    tracemalloc.start()
+    easts = Clindoc.load_folder(parameters)
+    print(tracemalloc.get_traced_memory()[1] / 1e6, file=sys.stderr)
+else:
+    # ru_maxrss is in KB on Linux
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    easts = Clindoc.load_folder(parameters)
+    print((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) / 1e3, file=sys.stderr)
+'''
+
+
+def generate(filename, size):
+    with open(filename, 'w') as f:
+        f.write('%@section(Chain) -> Generated rules\n')
+        f.write('p0(1).\n')
+        for i in range(1, size):
+            f.write(f'%- Rule {i}\n')
+            f.write(f'p{i}(X) :- p{i - 1}(X), q(X), not r{i % 10}(X).\n')
+
+
+def measure(src_dir, mode):
+    result = subprocess.run([sys.executable, '-c', CHILD, src_dir, mode], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(result.stderr.strip().splitlines()[-1])
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    generate(os.path.join(tmp, 'chain.lp'), RULES)
+    traced = measure(tmp, 'tracemalloc')
+    rss = measure(tmp, 'rss')
+
+print(f'{RULES} rules: peak of the Python allocations {traced:.0f} MB, peak RSS increase {rss:.0f} MB')
+assert rss < BUDGET, f'the analysis of {RULES} rules takes more than {BUDGET} MB'
+print()
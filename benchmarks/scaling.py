@@ -0,0 +1,41 @@
+# %% Scaling benchmark
+# Times the analysis of generated LP files of increasing size, the time per rule must stay about the same.
+# Run from the root of the repository: python benchmarks/scaling.py
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from clindoc import Clindoc
+
+SIZES = [1000, 2000, 4000, 8000]
+# Largest accepted ratio between the time per rule of the largest file and the one of the smallest file
+MAX_RATIO = 2.0
+
+
+def generate(filename, size):
+    with open(filename, 'w') as f:
+        f.write('p0(1).\n')
+        for i in range(1, size):
+            f.write(f'p{i}(X) :- p{i - 1}(X), q(X), not r{i % 10}(X).\n')
+
+
+per_rule = []
+with tempfile.TemporaryDirectory() as tmp:
+    parameters = Clindoc({'src_dir': tmp, 'no_cache': True}).parameters
+    for size in SIZES:
+        filename = os.path.join(tmp, f'chain-{size}.lp')
+        generate(filename, size)
+        start = time.perf_counter()
+        Clindoc.load_file(filename, parameters)
+        duration = time.perf_counter() - start
+        per_rule.append(duration / size)
+        print(f'{size} rules: {duration * 1000:.0f} ms ({duration / size * 1e6:.0f} us per rule)')
+
+ratio = per_rule[-1] / per_rule[0]
+print(f'Time per rule ratio ({SIZES[-1]} / {SIZES[0]} rules): {ratio:.2f}')
+assert ratio < MAX_RATIO, 'the analysis does not scale linearly with the size of the file'
+print()
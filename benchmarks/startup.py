@@ -0,0 +1,40 @@
+# %% Startup benchmark
+# Times `clindoc --version` and `clindoc --help` in fresh interpreters, and checks that no heavy dependency is imported by them.
+# Run from the root of the repository: python benchmarks/startup.py
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+RUNS = 5
+# Startup budget of the command line, in seconds
+BUDGET = 1.0
+HEAVY_MODULES = ['sphinx', 'clingo', 'graphviz', 'rstcloth']
+
+# The child prints its own duration (interpreter startup excluded) and the heavy modules it imported
+CHILD = f'''
+import sys, time
+start = time.perf_counter()
+import clindoc
+sys.argv = ['clindoc', sys.argv[1]]
+try:
+    clindoc.main()
+except SystemExit:
+    pass
+heavy = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(time.perf_counter() - start, ','.join(heavy), file=sys.stderr)
+'''
+
+for option in ['--version', '--help']:
+    durations = []
+    for _ in range(RUNS):
+        result = subprocess.run([sys.executable, '-c', CHILD, option], cwd=ROOT, capture_output=True, text=True, check=True)
+        duration, _, heavy = result.stderr.strip().splitlines()[-1].partition(' ')
+        durations.append(float(duration))
+        assert not heavy, f'clindoc {option} imports {heavy}'
+
+    median = statistics.median(durations)
+    print(f'clindoc {option}: {median * 1000:.0f} ms (median of {RUNS} runs)')
+    assert median < BUDGET, f'clindoc {option} takes more than {BUDGET}s'
+print()
@@ -52,6 +52,43 @@ def main():
                                 action="store_true",
                                 help="(flag,debug) skip rst build section")
 
+    clindoc_cmd_usage.add_argument('--no-cache',
+                                action="store_true",
+                                help="(flag) analyze every LP file again instead of reusing the cache stored in [doc-dir]/.clindoc-cache")
+
+    clindoc_cmd_usage.add_argument('--watch',
+                                action="store_true",
+                                help="(flag) keep watching [src-dir] and update the documentation each time a LP file changes")
+
+    clindoc_cmd_usage.add_argument('--watch-interval',
+                                action="store",
+                                type=float,
+                                default=1.0,
+                                help="Time in seconds between two checks of [src-dir] in watch mode")
+
+    clindoc_cmd_usage.add_argument('--fact-files',
+                                action="store",
+                                nargs='*',
+                                help="Glob pattern(s), relative to [src-dir], of the data files made only of facts. They are summarized per signature instead of being parsed, and left out of the dependency graphs")
+
+    clindoc_cmd_usage.add_argument('--fact-file-size',
+                                action="store",
+                                type=int,
+                                default=0,
+                                help="Size in bytes above which a LP file is tried as a data file (0 disables it)")
+
+    clindoc_cmd_usage.add_argument('--fact-sample',
+                                action="store",
+                                type=int,
+                                default=5,
+                                help="Number of fact statements of each signature shown for a data file")
+
+    clindoc_cmd_usage.add_argument('--jobs', '-j',
+                                action="store",
+                                type=int,
+                                default=1,
+                                help="Number of processes used to load the LP files in parallel (0 uses every available core)")
+
 
     clindoc_cmd_usage.add_argument('--conf-path',
                                 action="store",
@@ -81,5 +118,8 @@ def main():
     c = Clindoc(
                 parameters = format_parameters(vars(args)))
 
-    c.build_documentation()
+    if c.parameters['watch']:
+        c.watch()
+    else:
+        c.build_documentation()
 
@@ -1,10 +1,12 @@
+from __future__ import annotations
 from enum import Enum
-
-from clingo.ast import AST, ASTType
-from typing import List
+from typing import List, TYPE_CHECKING
 
 from .symbol import Symbol
 
+if TYPE_CHECKING:
+    from clingo.ast import AST
+
 
 class ASTLineType(Enum):
     """
@@ -21,15 +23,24 @@ class ASTLineType(Enum):
 
 class ASTLine:
     """
-    Represents a line of the logic program, encapsulating the corresponding clingo AST node and the symbols defined or used on that line.
+    Represents a line of the logic program, with the symbols defined or used on that line.
+    Only the location and identifier of the line are taken from the clingo AST node, which is not referenced afterwards.
     :param ast: The clingo AST node corresponding to the line.
     :param define: The list of symbols defined on this line.
     :param dependencies: The list of symbols used on this line.
+
+    The symbols used in a negated literal are also in `negative_dependencies`, the others in `positive_dependencies` (by default, every dependency is positive).
     """
+    __slots__ = ('define', 'dependencies', 'positive_dependencies', 'negative_dependencies', 'comments', 'location', 'section', '_identifier', 'prefix', 'type')
+
+    # Shared by the lines without negative dependency
+    NO_DEPENDENCIES = frozenset()
+
     def __init__(self, ast: AST, define: List[Symbol], dependencies: List[Symbol]) -> None:
-        self.ast = ast
         self.define = define
         self.dependencies = dependencies
+        self.positive_dependencies = dependencies
+        self.negative_dependencies = self.NO_DEPENDENCIES
         self.comments = None
         self.location = ast.location
         self.section = None
@@ -53,6 +64,7 @@ class ASTLine:
         :param dependencies: A list of Symbol objects representing the dependencies in the logic statement.
         :return: An instance of the appropriate ASTLine subclass (e.g. Rule, Constraint, Fact, Definition, Input, or Output)
         """
+        from clingo.ast import ASTType
         
         ret = None
         if ast.ast_type == ASTType.Rule:
@@ -90,6 +102,8 @@ class ASTLine:
 
 
 class Rule(ASTLine):
+    __slots__ = ()
+
     def __init__(self, ast: AST, define: List[Symbol], dependencies: List[Symbol]) -> None:
         super().__init__(ast, define, dependencies)
         self.type = ASTLineType.Rule
@@ -97,17 +111,22 @@ class Rule(ASTLine):
 
 
 class Constraint(ASTLine):
-    id = 0
+    __slots__ = ('id',)
+
+    # Number of the next constraint, reset for each file
+    counter = 0
 
     def __init__(self, ast: AST, define: List[Symbol], dependencies: List[Symbol]) -> None:
         super().__init__(ast, define, dependencies)
         self.type = ASTLineType.Constraint
-        self.id = Constraint.id
-        Constraint.id += 1
+        self.id = Constraint.counter
+        Constraint.counter += 1
         self._identifier = f"Constraint#{self.id}"
 
 
 class Fact(ASTLine):
+    __slots__ = ()
+
     def __init__(self, ast: AST, define: List[Symbol], dependencies: List[Symbol]) -> None:
         super().__init__(ast, define, dependencies)
         self.type = ASTLineType.Fact
@@ -115,31 +134,39 @@ class Fact(ASTLine):
 
 
 class Definition(ASTLine):
+    __slots__ = ()
+
     def __init__(self, ast: AST, define: List[Symbol], dependencies: List[Symbol]) -> None:
         super().__init__(ast, define, dependencies)
         self.type = ASTLineType.Definition
-        self._identifier = f"{self.ast.name}"
+        self._identifier = f"{ast.name}"
 
 
 class Input(ASTLine):
+    __slots__ = ()
+
     def __init__(self, ast: AST, define: List[Symbol], dependencies: List[Symbol]) -> None:
         super().__init__(ast, define, dependencies)
         self.type = ASTLineType.Input
-        self._identifier = f"{self.ast.name}/{self.ast.arity}"
+        self._identifier = f"{ast.name}/{ast.arity}"
 
 
 class Output(ASTLine):
+    __slots__ = ()
+
     def __init__(self, ast: AST, define: List[Symbol], dependencies: List[Symbol]) -> None:
         super().__init__(ast, define, dependencies)
         self.type = ASTLineType.Output
-        if 'term' in self.ast.keys():
-            self._identifier = f"{self.ast.term.name}/{len(self.ast.term.arguments)}"
+        if 'term' in ast.keys():
+            self._identifier = f"{ast.term.name}/{len(ast.term.arguments)}"
         else:
-            self._identifier = f"{self.ast.name}/{len(self.ast.arguments)}"
+            self._identifier = f"{ast.name}/{len(ast.arguments)}"
 
 
 class Constant(ASTLine):
+    __slots__ = ()
+
     def __init__(self, ast: AST, define: List[Symbol], dependencies: List[Symbol]) -> None:
         super().__init__(ast, define, dependencies)
         self.type = ASTLineType.Constant
-        self._identifier = self.ast.name
+        self._identifier = ast.name
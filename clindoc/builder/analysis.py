@@ -0,0 +1,171 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Set, Tuple
+
+from ..astline import ASTLine, ASTLineType
+from ..graph import strongly_connected_components
+
+
+class PredicateGraph:
+    """
+    Predicate dependency graph of the program, and its analysis.
+    There is an edge from a predicate to each predicate defined by a rule depending on it, negative if the rule uses it in a negated literal, positive otherwise (an edge can be both).
+
+    The analysis runs in time linear in the size of the graph:
+
+    * the strongly connected components, a component being recursive if its predicates depend on each other (or a predicate on itself),
+    * the cycles of each recursive component: positive if a cycle only uses positive edges, negative if a cycle goes through a negative edge,
+    * a stratification order, where each predicate comes after the predicates it depends on, and strictly after the ones it depends on negatively.
+
+    The transitive closure (which predicates each predicate influences) is computed on demand, see :meth:`get_influence`.
+
+    :param lines: The AST lines of the program.
+    """
+
+    POSITIVE = 1
+    NEGATIVE = 2
+
+    def __init__(self, lines: List[ASTLine]) -> None:
+        self.signatures: List[str] = []
+        self.index: Dict[str, int] = {}
+        # Signs of each edge, as POSITIVE and NEGATIVE flags
+        self.edges: Dict[Tuple[int, int], int] = {}
+
+        for al in lines:
+            if al.type != ASTLineType.Rule:
+                continue
+            for define in al.define:
+                b = self._node(define.signature)
+                for sign, dependencies in ((self.POSITIVE, al.positive_dependencies), (self.NEGATIVE, al.negative_dependencies)):
+                    for depend in dependencies:
+                        a = self._node(depend.signature)
+                        self.edges[(a, b)] = self.edges.get((a, b), 0) | sign
+
+        n = len(self.signatures)
+        self.component = strongly_connected_components(n, self.edges)
+        self.members: List[List[int]] = [[] for _ in range(max(self.component, default=-1) + 1)]
+        for node, c in enumerate(self.component):
+            self.members[c].append(node)
+
+        # A cycle only made of positive edges is a cycle of the graph restricted to the positive edges
+        positive_edges = [edge for edge, sign in self.edges.items() if sign & self.POSITIVE]
+        positive_component = strongly_connected_components(n, positive_edges)
+        positive_size: Dict[int, int] = {}
+        for c in positive_component:
+            positive_size[c] = positive_size.get(c, 0) + 1
+
+        self.recursive = [False] * len(self.members)
+        self.positive_cycle = [False] * len(self.members)
+        self.negative_cycle = [False] * len(self.members)
+        for c, m in enumerate(self.members):
+            if len(m) > 1:
+                self.recursive[c] = True
+            if any(positive_size[positive_component[node]] > 1 for node in m):
+                self.positive_cycle[c] = True
+        for (a, b), sign in self.edges.items():
+            c = self.component[a]
+            if c != self.component[b]:
+                continue
+            # Every edge inside a component is on a cycle
+            self.recursive[c] = True
+            if sign & self.NEGATIVE:
+                self.negative_cycle[c] = True
+            if sign & self.POSITIVE and a == b:
+                self.positive_cycle[c] = True
+
+        # Components are numbered in reverse topological order, the predicates a component depends on are in components with a greater number
+        self.stratum = [0] * len(self.members)
+        predecessors: List[List[Tuple[int, int]]] = [[] for _ in self.members]
+        for (a, b), sign in self.edges.items():
+            if self.component[a] != self.component[b]:
+                predecessors[self.component[b]].append((self.component[a], sign))
+        for c in reversed(range(len(self.members))):
+            for p, sign in predecessors[c]:
+                self.stratum[c] = max(self.stratum[c], self.stratum[p] + (1 if sign & self.NEGATIVE else 0))
+
+        self.influence: List[int] | None = None
+
+    def _node(self, signature: str) -> int:
+        node = self.index.get(signature)
+        if node is None:
+            node = len(self.signatures)
+            self.signatures.append(signature)
+            self.index[signature] = node
+        return node
+
+    def get_influence(self) -> List[int]:
+        """
+        Compute the transitive closure of the graph once, as bitsets (Python integers): bit j of the influence of node i is set if the predicate j depends, directly or not, on the predicate i.
+        A predicate influences itself only if it is recursive.
+        The closure is computed per component, from the last predicates to the first ones, with one bitwise or per edge between components.
+        The predicates of a component share the same bitset.
+
+        :return: The influence of each node.
+        """
+        if self.influence is None:
+            mask = [0] * len(self.members)
+            for c, m in enumerate(self.members):
+                for node in m:
+                    mask[c] |= 1 << node
+            successors: List[Set[int]] = [set() for _ in self.members]
+            for a, b in self.edges:
+                if self.component[a] != self.component[b]:
+                    successors[self.component[a]].add(self.component[b])
+
+            # The successors of a component have a smaller number, their closure is already computed
+            closure = [0] * len(self.members)
+            for c in range(len(self.members)):
+                reach = mask[c] if self.recursive[c] else 0
+                for d in successors[c]:
+                    reach |= mask[d] | closure[d]
+                closure[c] = reach
+            self.influence = [closure[c] for c in self.component]
+        return self.influence
+
+    def get_mask(self, signatures: Iterable[str]) -> int:
+        """
+        :param signatures: Some signatures.
+        :return: The bitset of the nodes of the signatures, the signatures which are not in the graph are ignored.
+        """
+        ret = 0
+        for signature in signatures:
+            node = self.index.get(signature)
+            if node is not None:
+                ret |= 1 << node
+        return ret
+
+    @property
+    def stratified(self) -> bool:
+        """
+        True if no predicate depends negatively on itself, through any cycle.
+        """
+        return not any(self.negative_cycle)
+
+    @property
+    def tight(self) -> bool:
+        """
+        True if there is no positive cycle.
+        """
+        return not any(self.positive_cycle)
+
+    def get_recursive_components(self) -> List[int]:
+        """
+        :return: The recursive components, the largest first.
+        """
+        components = [c for c in range(len(self.members)) if self.recursive[c]]
+        return sorted(components, key=lambda c: (-len(self.members[c]), self.get_signatures(c)))
+
+    def get_signatures(self, component: int) -> List[str]:
+        """
+        :param component: A component.
+        :return: The signatures of the predicates of the component, sorted.
+        """
+        return sorted(self.signatures[node] for node in self.members[component])
+
+    def get_strata(self) -> List[List[str]]:
+        """
+        :return: The signatures of the predicates of each stratum, sorted, from the first stratum.
+        """
+        strata: List[List[str]] = [[] for _ in range(max(self.stratum, default=-1) + 1)]
+        for node, c in enumerate(self.component):
+            strata[self.stratum[c]].append(self.signatures[node])
+        return [sorted(stratum) for stratum in strata]
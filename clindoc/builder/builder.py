@@ -1,9 +1,13 @@
+from __future__ import annotations
 from ..east import EnrichedAST
+from ..directive import DirectiveRegistry
 from .component import Component, Index, Source
 from .contributodocumentation import ContributorDocumentation
 from .graphs import DependencyGraph
+from .project import Project
 from .userdocumentation import UserDocumentation
-from typing import List, Dict
+from typing import List, Dict, Set
+from concurrent.futures import ThreadPoolExecutor
 
 
 
@@ -21,17 +25,15 @@ class Builder:
 
         self.parameters = parameters
         self.easts = easts
+        self.dirty = None
         self.components = self._initialize_component()
         self.all_directives = self.unit_directives()
+        self.project = Project(self.easts, self.all_directives)
         
-    def unit_directives(self)->dict:
-        all_directives = {}
+    def unit_directives(self)->DirectiveRegistry:
+        all_directives = DirectiveRegistry()
         for east in self.easts:
-            for key in east.directives:
-                if key in all_directives:
-                    all_directives[key] += east.directives[key]
-                else:
-                    all_directives[key] = east.directives[key]
+            all_directives.extend(east.directives)
         return all_directives
     
 
@@ -43,14 +45,39 @@ class Builder:
             print(f'Components {component.name} loaded')
         return component_list
 
-    def build(self):
+    def build(self, dirty: Set[str] | None = None):
+        """
+        Build and write the components.
+
+        :param dirty: If given, the filenames of the files that changed since the previous build, only the components (and parts of components) depending on them are regenerated.
+        """
+        self.dirty = dirty
+        components = []
         for c in self.components:
             build = True
             if (c.name != 'index') and self.parameters[c.name]['exclude']:
                 build = False
 
-            if build:
-                c.build_rst_file()
-                c.write_rst_file()
+            if build and (dirty is None or c.is_affected(dirty)):
+                components.append(c)
+
+        # The data computed on demand is computed once here, before it is read by several components at the same time
+        if any('predicate_graph' in c.reads for c in components):
+            self.project.get_predicate_graph()
+
+        # Each component writes its own document, so they are built concurrently (the dependency graphs mostly wait for graphviz meanwhile)
+        # Threads rather than processes: the components share the project model and their documents with the builder, a process would get a pickled copy of
+        # the whole project and would have to send its document back, while the slow part already runs in the graphviz processes
+        # The components describing the other ones (e.g. the index) are built after them
+        first = [c for c in components if 'components' not in c.reads]
+        last = [c for c in components if 'components' in c.reads]
+        with ThreadPoolExecutor(max_workers=len(first) or 1) as executor:
+            for job in [executor.submit(c.build_rst_file) for c in first]:
+                job.result()
+        for c in last:
+            c.build_rst_file()
+
+        for c in components:
+            c.write_rst_file()
 
 
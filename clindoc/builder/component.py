@@ -1,13 +1,14 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import List, Set, Tuple
 from argparse import ArgumentParser
-from rstcloth import RstCloth
 import os
 from io import StringIO
 
 from ..east import EnrichedAST
+from ..facts import FactFile
 from ..astline import ASTLine
+from ..utils import write_if_changed
 
 
 class Component(ABC):
@@ -20,9 +21,15 @@ class Component(ABC):
     
     parse_group_description = "DEFAULT PARSER GROUP DESCRIPTION"
     name = "DEFAULT_NAME"
+    FACT_FILE_PREVIEW_LINES = 100
+    # The data of the builder read by the component: "easts", "project", "predicate_graph" (see Project.get_predicate_graph),
+    # or "components" for a component describing the other ones, which is then built after them
+    reads: Tuple[str, ...] = ('easts',)
 
 
     def __init__(self, builder:'Builder', parameters) -> None:
+        from rstcloth import RstCloth
+
         self.builder = builder
         self._sio = StringIO()
         self.document = RstCloth(self._sio)
@@ -66,6 +73,15 @@ class Component(ABC):
             
 
 
+    def is_affected(self, dirty: Set[str]) -> bool:
+        """
+        Tell if the component needs to be built again after some files changed.
+
+        :param dirty: The filenames of the files that changed (or include a file that changed).
+        :return: True if the component depends on the content of these files.
+        """
+        return True
+
     @abstractmethod
     def build_rst_file(self) -> None:
         """
@@ -80,8 +96,8 @@ class Component(ABC):
         Write the reStructuredText file to disk.
         """
         if self._sio.getvalue():  # Things have been written
-            with open(os.path.join(self.parameters['doc_dir'], self.name + ".rst"), 'w') as file:
-                file.write(self._sio.getvalue())
+            # Unchanged pages are not written again, Sphinx then keeps their doctree from the previous build
+            write_if_changed(os.path.join(self.parameters['doc_dir'], self.name + ".rst"), self._sio.getvalue())
 
 
 
@@ -145,10 +161,15 @@ class Component(ABC):
 
         :param east: An instance of the EnrichedAST class.
         """
+        fields = [('language','prolog'),
+                  ('linenos' , '')]
+        if isinstance(east, FactFile):
+            # Data files can be huge, only their beginning is shown
+            fields.append(('lines', f'1-{min(east.line_count, self.FACT_FILE_PREVIEW_LINES)}'))
+
         self.document.directive('literalinclude', 
                                 arg=f'/{east.filename}',
-                                fields=[('language','prolog'),
-                                        ('linenos' , '')])
+                                fields=fields)
         self.document.newline()
 
         
@@ -157,6 +178,7 @@ class Component(ABC):
 
 class Index(Component):
     name = 'index'
+    reads = ('components',)
 
     @classmethod
     def cmdline_documentation(cls, parser: ArgumentParser) -> ArgumentParser:
@@ -170,6 +192,9 @@ class Index(Component):
     def check_parameters(self):
         super().check_parameters()
 
+    def is_affected(self, dirty: Set[str]) -> bool:
+        return False
+
     def _generate_toctree(self):
         self.document._add('.. toctree::')
         self.document._add(' :maxdepth: 2')
@@ -212,6 +237,9 @@ class Source(Component):
         if not 'exclude_file' in self.parameters[self.name]:
             self.parameters[self.name]['exclude_file']= False
 
+    def is_affected(self, dirty: Set[str]) -> bool:
+        # Only the list of files is written, the content is included by Sphinx
+        return False
 
     def build_rst_file(self) -> None:
         self.document.title('Source Code')
@@ -1,6 +1,9 @@
 
+from typing import Dict
+
 from .component import Component
-from ..astline import  ASTLine
+from ..astline import  ASTLine, ASTLineType
+from ..facts import FactFile
 
 from argparse import ArgumentParser
 
@@ -8,6 +11,7 @@ from argparse import ArgumentParser
 class ContributorDocumentation(Component):
     parse_group_description = 'Contributor Documentation parameters'
     name = 'contributordoc'
+    reads = ('easts', 'project', 'predicate_graph')
 
     @classmethod
     def cmdline_documentation(cls, parser: ArgumentParser):
@@ -58,18 +62,16 @@ class ContributorDocumentation(Component):
         self.document.h4(f"{self._get_name(astline)}")
         self.document.newline()
 
-        if 'predicate' in self.builder.all_directives:
-            for directive in self.builder.all_directives['predicate']:
-
-                if directive.parameters[0] == astline.identifier:
-                    self.document.content(f'{directive.parameters[1]} -> {directive.description}')
-                    self.document.newline()
+        for directive in self.builder.project.get_directives('predicate', astline.identifier):
+            self.document.content(f'{directive.parameters[1]} -> {directive.description}')
+            self.document.newline()
         
         
         if astline.dependencies:
             self.document.h5(f"Dependencies:")
             d_done = []
-            for d in astline.dependencies:
+            # Sorted, so that the page only changes when the program does
+            for d in sorted(astline.dependencies, key=lambda d: d.signature):
                 if d.signature not in d_done:
                     self.document.li(d.signature)
                     d_done.append(d.signature)
@@ -88,7 +90,7 @@ class ContributorDocumentation(Component):
     def _build_variable_table(self):
         self.document.h2('Variables')
         self.document.newline()
-        vars = self.builder.all_directives.get('var')
+        vars = self.builder.project.get_directives('var')
         data = []
         if vars:
             for var in vars:
@@ -97,6 +99,68 @@ class ContributorDocumentation(Component):
         self.document.table(['Variable', 'Definition'], data=data)
         self.document.newline()
 
+    def _build_impact_tables(self):
+        """
+        Document which outputs (#show) depend on each input (#defined) and on each predicate, and how many predicates each predicate influences.
+        Every answer is read from the transitive closure of the predicate dependency graph, computed once as bitsets (see :meth:`PredicateGraph.get_influence`).
+        """
+        graph = self.builder.project.get_predicate_graph()
+        influence = graph.get_influence()
+
+        # Each output is given by the predicates it shows, the lines of the included files outside of src_dir are part of the project too
+        outputs: Dict[str, int] = {}
+        output_signatures: Dict[str, set] = {}
+        inputs = set()
+        for astline in self.builder.project.lines:
+            if astline.type == ASTLineType.Output:
+                signatures = [d.signature for d in astline.dependencies]
+                outputs[astline.identifier] = outputs.get(astline.identifier, 0) | graph.get_mask(signatures)
+                output_signatures.setdefault(astline.identifier, set()).update(signatures)
+            elif astline.type == ASTLineType.Input:
+                inputs.add(astline.identifier)
+        sorted_outputs = sorted(outputs)
+
+        def impacted(signature: str):
+            node = graph.index.get(signature)
+            reach = influence[node] | 1 << node if node is not None else 0
+            return ', '.join(o for o in sorted_outputs if outputs[o] & reach or signature in output_signatures[o])
+
+        self.document.h2('Impact analysis')
+        self.document.newline()
+        # Rubrics rather than titles: the title styles of the lines above depend on the grouping and on the sections found
+        if inputs:
+            self.document.directive('rubric', 'Inputs')
+            self.document.newline()
+            self.document.table(['Input', 'Outputs'], data=[[i, impacted(i)] for i in sorted(inputs)])
+            self.document.newline()
+
+        self.document.directive('rubric', 'Predicates')
+        self.document.newline()
+        data = []
+        for signature in sorted(graph.signatures):
+            node = graph.index[signature]
+            others = influence[node] & ~(1 << node)
+            data.append([signature, str(bin(others).count('1')), impacted(signature)])
+        self.document.table(['Predicate', 'Influenced predicates', 'Outputs'], data=data)
+        self.document.newline()
+
+    def _build_fact_files(self):
+        fact_files = [east for east in self.builder.easts if isinstance(east, FactFile)]
+        if not fact_files:
+            return
+
+        self.document.h2('Data files')
+        self.document.newline()
+        for fact_file in fact_files:
+            self.document.h3(fact_file.filename.replace(self.parameters['src_dir'] + '/', ''))
+            self.document.newline()
+            data = []
+            # A statement with an interval or a pool (e.g. p(1..3).) gives several facts, but is counted once
+            for signature, count in sorted(fact_file.signatures.items()):
+                data.append([signature, str(count), ' '.join(fact_file.samples[signature])])
+            self.document.table(['Signature', 'Statements', 'Sample'], data=data)
+            self.document.newline()
+
     def build_rst_file(self):
 
         self.document.title("Contributor Documentation")
@@ -130,16 +194,14 @@ class ContributorDocumentation(Component):
             self.document.newline()
 
             sections = {}
+            # The lines are grouped by section name, the first directive of each name being kept
+            section_directives = {}
             no_section = []
             for east in self.builder.easts:
                 for astline in east.ast_lines:
                     if astline.section != None:
-                        for key in sections:
-                            if key.parameters[0] == astline.section.parameters[0]:
-                                sections[key] .append(astline)
-                                break
-                        else:
-                            sections[astline.section] = [astline]
+                        key = section_directives.setdefault(astline.section.parameters[0], astline.section)
+                        sections.setdefault(key, []).append(astline)
                     else:
                         no_section.append(astline)
 
@@ -164,3 +226,6 @@ class ContributorDocumentation(Component):
 
         else:
             raise ValueError(f"invalid groupby value: {self.groupby}")
+
+        self._build_impact_tables()
+        self._build_fact_files()
@@ -1,22 +1,36 @@
-from typing import Dict
-import graphviz
+from __future__ import annotations
+from typing import Dict, List, Set, Tuple
 import os
 
-from ..astline import ASTLineType
+from ..astline import ASTLine, ASTLineType
+from ..cache import AnalysisCache
+from ..east import EnrichedAST
+from ..symbol import Symbol
+from ..facts import FactFile
+from ..graph import induced_subgraph, strongly_connected_components
 from .component import Component, ArgumentParser
-from ..utils import create_dir, filename_from_source
+from .render import GraphRenderer
+from ..utils import create_dir, filename_from_source, replace_if_changed, write_if_changed
 
 
 
 class DependencyGraph(Component):
     name = "dependencygraph"
     parse_group_description = "Dependency graph parameters"
+    reads = ('easts', 'project', 'predicate_graph')
+    # Directory of the graphs of the whole program, not a valid name for a file graph since it does not come from a source file
+    project_dirname = "_project"
 
     @classmethod
     def cmdline_documentation(cls, parser: ArgumentParser) -> ArgumentParser:
         group = super().cmdline_documentation(parser)
 
-        group.add_argument('--dependencygraph.format', action='store', default="svg", help="Format of the graphs ")
+        group.add_argument('--dependencygraph.format', action='store', default="svg", help="Format of the graphs, json for an interactive viewer instead of images")
+        group.add_argument('--dependencygraph.jobs', action='store', type=int, default=0, help="Number of graphs rendered at the same time, 0 for the number of CPUs")
+        group.add_argument('--dependencygraph.timeout', action='store', type=float, default=60, help="Time limit in seconds to render a graph, 0 for no limit")
+        group.add_argument('--dependencygraph.max-nodes', action='store', type=int, default=300, help="Number of nodes above which a graph is rendered in large-graph mode, 0 for no limit")
+        group.add_argument('--dependencygraph.max-edges', action='store', type=int, default=1000, help="Number of edges above which a graph is rendered in large-graph mode, 0 for no limit")
+        group.add_argument('--dependencygraph.large-engine', action='store', default="sfdp", help="Graphviz layout engine used in large-graph mode")
 
 
 
@@ -29,116 +43,507 @@ class DependencyGraph(Component):
         if not 'format' in self.parameters[self.name]:
             self.parameters[self.name]['format'] = 'svg'
 
+        if not 'jobs' in self.parameters[self.name]:
+            self.parameters[self.name]['jobs'] = 0
+        elif self.parameters[self.name]['jobs'] < 0:
+            raise ValueError(f"invalid dependencygraph.jobs value: {self.parameters[self.name]['jobs']}")
+
+        if not 'timeout' in self.parameters[self.name]:
+            self.parameters[self.name]['timeout'] = 60
+
+        if not 'max_nodes' in self.parameters[self.name]:
+            self.parameters[self.name]['max_nodes'] = 300
+
+        if not 'max_edges' in self.parameters[self.name]:
+            self.parameters[self.name]['max_edges'] = 1000
+
+        if not 'large_engine' in self.parameters[self.name]:
+            self.parameters[self.name]['large_engine'] = 'sfdp'
+
 
     def build_rst_file(self) -> None:
+        if self.parameters[self.name]['format'] == 'json':
+            self._build_json_rst_file()
+            return
+
         # Create folder for graphs
         create_dir(os.path.join(self.parameters['doc_dir'], "img"))
 
+        # The graphs are rendered while the next ones are generated
+        cache_dir = None
+        if not self.parameters.get('no_cache'):
+            cache_dir = os.path.join(self.parameters['doc_dir'], AnalysisCache.DIRNAME, 'render')
+        self.renderer = GraphRenderer(self.parameters[self.name]['jobs'] or None,
+                                      self.parameters[self.name]['timeout'] or None,
+                                      cache_dir)
+        # Names of the per-section rule (and definition) graphs of each file, for the files whose rule (or definition) graph is too large
+        self.section_graphs: Dict[str, List[Tuple[str, str]]] = {}
+        self.definition_section_graphs: Dict[str, List[Tuple[str, str]]] = {}
         self._build_rule_dependency_graph()
         self._build_definition_dependency_graph()
+        self.renderer.wait()
+        # On a partial build, only the graphs of the changed files were submitted
+        if self.builder.dirty is None:
+            self.renderer.prune()
 
         self.document.title('Dependency Graphs')
         self.document.newline()
-        for east in self.builder.easts:
+        for title, dirname, _ in self._views(all_views=True):
             self.document.newline()
-            self.document.h2(filename_from_source(
-                self.parameters['src_dir'], east.filename).replace('.lp', ''))
+            self.document.h2(title)
             self.document.newline()
             self.document.directive('image', '/' + os.path.join( self.parameters['doc_dir'],"img",
-                                    filename_from_source(self.parameters['src_dir'], east.filename).replace('.lp', ''), "rdg."+ self.parameters[self.name]['format']).strip())
+                                    dirname, "rdg."+ self.parameters[self.name]['format']).strip())
             self.document.newline()
 
+            for section, graph_name in self.section_graphs.get(dirname, []):
+                self.document.h3(f'Rules of section: {section}')
+                self.document.newline()
+                self.document.directive('image', '/' + os.path.join( self.parameters['doc_dir'],"img",
+                                        dirname, f"{graph_name}."+ self.parameters[self.name]['format']).strip())
+                self.document.newline()
+
             self.document.directive('image', '/'+ os.path.join( self.parameters['doc_dir'],"img",
-                                    filename_from_source(self.parameters['src_dir'], east.filename).replace('.lp', ''), "ddg."+ self.parameters[self.name]['format']).strip())
+                                    dirname, "ddg."+ self.parameters[self.name]['format']).strip())
             self.document.newline()
 
+            for section, graph_name in self.definition_section_graphs.get(dirname, []):
+                self.document.h3(f'Definitions of section: {section}')
+                self.document.newline()
+                self.document.directive('image', '/' + os.path.join( self.parameters['doc_dir'],"img",
+                                        dirname, f"{graph_name}."+ self.parameters[self.name]['format']).strip())
+                self.document.newline()
+
+        self._build_recursion_analysis()
+
+
+    def _build_json_rst_file(self) -> None:
+        """
+        Document the graphs in the JSON format, shown by the viewer of static/graph.js instead of as images.
+        The layout is computed in the browser, so the graphviz executables are not needed.
+        """
+        import shutil
+
+        self.section_graphs = {}
+        self.definition_section_graphs = {}
+        self._build_rule_dependency_graph()
+        self._build_definition_dependency_graph()
+        static_dir = os.path.join(self.parameters['doc_dir'], "_static", "clindoc")
+        create_dir(static_dir)
+        shutil.copyfile(os.path.join(os.path.dirname(__file__), "static", "graph.js"),
+                        os.path.join(static_dir, "graph.js.tmp"))
+        replace_if_changed(os.path.join(static_dir, "graph.js.tmp"), os.path.join(static_dir, "graph.js"))
+
+        self.document.title('Dependency Graphs')
+        self.document.newline()
+        # The graphs are fetched by the viewer, the html documentation must be served over HTTP (e.g. python -m http.server)
+        self.document.directive('raw', 'html', content=['<script src="_static/clindoc/graph.js"></script>'])
+        self.document.newline()
+        for title, dirname, _ in self._views(all_views=True):
+            self.document.newline()
+            self.document.h2(title)
+            self.document.newline()
+            for graph in ('rdg', 'ddg'):
+                self.document.directive('raw', 'html', content=[
+                    f'<div class="clindoc-graph" data-src="_static/clindoc/{dirname}/{graph}.json"></div>'])
+                self.document.newline()
+
+        self._build_recursion_analysis()
+
+    def _build_recursion_analysis(self) -> None:
+        """
+        Document the recursion of the whole program (see :class:`PredicateGraph`): the recursive components of the predicate dependency graph and their cycles, and a stratification order.
+        The predicates of large recursive components are usually where most of the grounding and solving effort goes.
+        """
+        graph = self.builder.project.get_predicate_graph()
+        components = graph.get_recursive_components()
+
+        self.document.newline()
+        self.document.h2('Recursion analysis')
+        self.document.newline()
+        self.document.content(f'{len(graph.signatures)} predicates, {len(graph.edges)} dependencies between predicates, '
+                              f'{len(components)} recursive components.')
+        self.document.newline()
+        if graph.stratified:
+            self.document.content('The program is stratified: no predicate depends negatively on itself.')
+        else:
+            self.document.content('The program is not stratified: some predicates depend negatively on themselves (negative cycles below).')
+        self.document.newline()
+        if graph.tight:
+            self.document.content('The program is tight: no predicate depends positively on itself.')
+        else:
+            self.document.content('The program is not tight: some predicates depend positively on themselves (positive cycles below).')
+        self.document.newline()
+
+        if components:
+            self.document.h3('Recursive components')
+            self.document.newline()
+            data = []
+            for c in components:
+                cycles = [name for name, found in (('positive', graph.positive_cycle[c]), ('negative', graph.negative_cycle[c])) if found]
+                data.append([str(len(graph.members[c])), ', '.join(graph.get_signatures(c)), ', '.join(cycles)])
+            self.document.table(['Predicates', 'Signatures', 'Cycles'], data=data)
+            self.document.newline()
+
+        self.document.h3('Stratification')
+        self.document.newline()
+        self.document.content('Each predicate only depends on predicates of the same or a previous stratum, and negatively only on predicates of a previous stratum'
+                              + (', except inside negative cycles.' if not graph.stratified else '.'))
+        self.document.newline()
+        self.document.table(['Stratum', 'Signatures'], data=[[str(i), ', '.join(stratum)] for i, stratum in enumerate(graph.get_strata())])
+        self.document.newline()
+
+    def _views(self, all_views: bool = False) -> List[Tuple[str, str, EnrichedAST | None]]:
+        """
+        The graphs of the documentation: one for each file (with the files it includes), and one for the whole program if there are several files.
+        Each is a view of the project graph, so included files are not analyzed again for each file including them.
+
+        :param all_views: If False, only the views to render again are returned, every one of them unless the builder only updates the changed files.
+        :return: The title, the directory and the EnrichedAST (None for the whole program) of each view.
+        """
+        # Data files have no AST line, so no graph
+        easts = [east for east in self.builder.easts if not isinstance(east, FactFile)]
+        views = []
+        if len(easts) > 1:
+            views.append(('Whole program', self.project_dirname, None))
+        for east in easts:
+            if all_views or self.builder.dirty is None or east.filename in self.builder.dirty:
+                dirname = filename_from_source(self.parameters['src_dir'], east.filename).replace('.lp', '')
+                views.append((dirname, dirname, east))
+        return views
+
+    def _render(self, g, dirname: str, name: str, engine: str = 'dot') -> None:
+        """
+        Write the DOT source of a graph next to its image, and schedule its rendering.
+
+        :param g: The graphviz.Digraph object.
+        :param dirname: The directory of the graphs of the view, see :meth:`_views`.
+        :param name: The name of the graph, "rdg" or "ddg".
+        :param engine: The graphviz layout engine.
+        """
+        directory = os.path.join(self.parameters['doc_dir'], "img", dirname)
+        create_dir(directory)
+        filename = os.path.join(directory, name)
+        key = self.renderer.write_source(g, filename + '.dot')
+        self.renderer.submit(filename + '.dot', filename + '.' + self.parameters[self.name]['format'],
+                             self.parameters[self.name]['format'], engine, key=key)
+
+    def _is_large(self, nodes: int, edges: int) -> bool:
+        """
+        Tell if a graph is above the thresholds of the large-graph mode.
+        """
+        max_nodes = self.parameters[self.name]['max_nodes']
+        max_edges = self.parameters[self.name]['max_edges']
+        return bool(max_nodes and nodes > max_nodes) or bool(max_edges and edges > max_edges)
+
+    def _engine(self, nodes: int, edges: int) -> str:
+        return self.parameters[self.name]['large_engine'] if self._is_large(nodes, edges) else 'dot'
+
+    def _sorted(self, symbols: Set[Symbol]) -> List[Symbol]:
+        # The symbols are sorted so that the same program always gives the same DOT source (see GraphRenderer)
+        return sorted(symbols, key=lambda symbol: symbol.signature)
+
+    def _section_name(self, al: ASTLine) -> str:
+        return al.section.parameters[0] if al.section else 'No section'
+
+    def _collapse_components(self, names: List[str], edges: Set[Tuple[int, int]]) -> Tuple[List[str], Set[Tuple[int, int]]]:
+        """
+        Collapse each strongly connected component (i.e. each set of mutually dependent rules, or predicates) of a graph into a single node.
+
+        :param names: The names of the nodes.
+        :param edges: The edges, as pairs of indexes in names.
+        :return: The names and edges of the collapsed graph.
+        """
+        component = strongly_connected_components(len(names), edges)
+        members: Dict[int, List[int]] = {}
+        for node, c in enumerate(component):
+            members.setdefault(c, []).append(node)
+
+        collapsed_names = []
+        for c in range(len(members)):
+            m = members[c]
+            if len(m) == 1:
+                collapsed_names.append(names[m[0]])
+            else:
+                collapsed_names.append(f'{names[m[0]]} (+{len(m) - 1} mutually dependent)')
+        return collapsed_names, set((component[a], component[b]) for a, b in edges if component[a] != component[b])
+
+    def _collapse_sections(self, node_sections: List[str], edges: Set[Tuple[int, int]], unit: str) -> Tuple[List[str], Set[Tuple[int, int]]]:
+        """
+        Collapse the nodes of each section of a graph into a single node.
+
+        :param node_sections: The section of each node of the graph.
+        :param edges: The edges, as pairs of indexes of nodes.
+        :param unit: What the nodes are, e.g. "lines", shown with their number in the name of the collapsed nodes.
+        :return: The names and edges of the collapsed graph.
+        """
+        sections: Dict[str, int] = {}
+        section_of = [sections.setdefault(name, len(sections)) for name in node_sections]
+        counts = [0] * len(sections)
+        for s in section_of:
+            counts[s] += 1
+
+        # ':' would be read as a node port by graphviz
+        names = [f'Section {name.replace(":", " ")} ({counts[s]} {unit})' for name, s in sections.items()]
+        return names, set((section_of[a], section_of[b]) for a, b in edges if section_of[a] != section_of[b])
+
+    def _digraph(self, names: List[str], edges: Set[Tuple[int, int]], label: str, all_nodes: bool = False):
+        import graphviz
+
+        g = graphviz.Digraph('G', format=self.parameters[self.name]['format'])
+        if all_nodes:
+            # Collapsed nodes may have no edge left
+            for name in sorted(set(names)):
+                g.node(name)
+        g.edges(sorted(set((names[a], names[b]) for a, b in edges)))
+        g.attr(label=label)
+        g.attr(fontsize='20')
+        return g
 
     def _build_rule_dependency_graph(self):
-        for east in self.builder.easts:
-            g = graphviz.Digraph('G', format=self.parameters[self.name]['format'])
-            pool = []
-            for a in east.ast_lines + east.external_ast_lines:
-                if a.type == ASTLineType.Rule or a.type == ASTLineType.Constraint or a.type == ASTLineType.Fact:
-                    pool.append(a)
-
-            edges = set()   
-            for a in pool:
-                for b in pool:
-                    if a != b:
-                        for define in a.define:
-                            for depends in b.dependencies:
-                                if define.signature == depends.signature:
-                                    edges.add((self._get_name(
-                                        a) + '; l' + self._get_location(a), self._get_name(b) + '; l' + self._get_location(b)))
-
-
-            g.edges(edges)
-            g.attr(label='Rule Dependency Graph')
-            g.attr(fontsize='20')
-            g.render(filename=os.path.join(self.parameters['doc_dir'], "img", filename_from_source(
-                self.parameters['src_dir'], east.filename).replace('.lp', ''), "rdg"), view=False)
-
-    
-    def _build_definition_dependency_graph(self):
-        for east in self.builder.easts:
-            g = graphviz.Digraph('G',format=self.parameters[self.name]['format'])
-            edges =set()
-            for al in east.ast_lines + east.external_ast_lines:
-                if al.type == ASTLineType.Output:
-                    g.node(f"{al.identifier}",shape='Mdiamond')
+        project = self.builder.project
+        # The graphs of the unchanged files are not rendered again, but the page still lists their section graphs
+        rendered = set(dirname for _, dirname, _ in self._views())
+        for _, dirname, east in self._views(all_views=True):
+            # The graph of a file is the subgraph of the project graph induced by its lines and the lines it includes
+            nodes = project.get_rule_nodes(east) if east else list(range(len(project.rule_lines)))
+            pool = [project.rule_lines[node] for node in nodes]
+            edges = induced_subgraph(project.rule_successors, nodes)
+            render = dirname in rendered
+
+            if self.parameters[self.name]['format'] == 'json':
+                if render:
+                    # The viewer shows large graphs progressively, they are never collapsed
+                    groups = [ASTLineType.Rule.name, ASTLineType.Constraint.name, ASTLineType.Fact.name]
+                    self._write_json(dirname, 'rdg', 'Rule Dependency Graph', groups, self._rule_names(pool),
+                                     [groups.index(a.type.name) for a in pool], edges)
+                continue
+
+            if not self._is_large(len(pool), len(edges)):
+                if render:
+                    self._render(self._digraph(self._rule_names(pool), edges, 'Rule Dependency Graph'), dirname, "rdg")
+                continue
+
+            # Large-graph mode: an overview where mutually dependent rules (then whole sections if still too large) are single nodes,
+            # and one graph for the rules of each section
+            members: Dict[str, List[int]] = {}
+            for a, al in enumerate(pool):
+                members.setdefault(self._section_name(al), []).append(a)
+            self.section_graphs[dirname] = [(section, f"rdg-{idx}") for idx, section in enumerate(members)]
+            if not render:
+                continue
+
+            names = self._rule_names(pool)
+            overview_names, overview_edges = self._collapse_components(names, edges)
+            if self._is_large(len(overview_names), len(overview_edges)):
+                overview_names, overview_edges = self._collapse_sections([self._section_name(al) for al in pool], edges, 'lines')
+            self._render(self._digraph(overview_names, overview_edges, 'Rule Dependency Graph (overview)', True), dirname, "rdg",
+                         self._engine(len(overview_names), len(overview_edges)))
+
+            for (section, graph_name), nodes in zip(self.section_graphs[dirname], members.values()):
+                position = {a: i for i, a in enumerate(nodes)}
+                section_names = [names[a] for a in nodes]
+                section_edges = set((position[a], position[b]) for a, b in edges if a in position and b in position)
+                if self._is_large(len(section_names), len(section_edges)):
+                    section_names, section_edges = self._collapse_components(section_names, section_edges)
+
+                self._render(self._digraph(section_names, section_edges, f'Rule Dependency Graph, section: {section}', True), dirname, graph_name,
+                             self._engine(len(section_names), len(section_edges)))
+
+    def _rule_names(self, pool: List[ASTLine]) -> List[str]:
+        return [self._get_name(a) + '; l' + self._get_location(a) for a in pool]
+
+    def _definition_graph(self, lines: List[ASTLine], input_lines: List[ASTLine]) -> Tuple[List[Tuple[str, List[str]]], Set[Tuple[str, str]]]:
+        """
+        Compute the nodes and edges of a definition dependency graph.
+
+        :param lines: The AST lines of the graph.
+        :param input_lines: The AST lines whose inputs are shown (the inputs of included files are not).
+        :return: The groups of nodes (Outputs, Facts, Inputs, Rules and Constraints) as pairs of a label and node names, and the edges as pairs of node names.
+        """
+        outputs, facts, inputs, rules, constraints = [], [], [], [], []
+        edges = set()
+        for al in lines:
+            if al.type == ASTLineType.Output:
+                outputs.append(f"{al.identifier}")
+                for depend in al.dependencies:
+                    edges.add((depend.signature,f"{al.identifier}"))
+
+        for al in lines:
+            if al.type == ASTLineType.Fact:
+                for define in self._sorted(al.define):
+                    facts.append(define.signature)
+                facts.append(al.identifier)
+
+        for al in input_lines:
+            if al.type == ASTLineType.Input:
+                inputs.append(f"{al.identifier}")
+
+        for al in lines:
+            if al.type == ASTLineType.Rule:
+                for define in self._sorted(al.define):
+                    rules.append(define.signature)
                     for depend in al.dependencies:
-                        edges.add((depend.signature,f"{al.identifier}"))
-                    # edges.add((depend.signature,define.signature))
-                    
+                        edges.add((depend.signature,define.signature))
 
-            with g.subgraph(name='clusterA') as c:
-                c.attr(style='filled', color='lightgrey')
-                c.node_attr.update(style='filled', color='white')
+        for al in lines:
+            if al.type == ASTLineType.Constraint:
+                # Constraints are numbered per file, the name is needed to tell included ones apart
+                for depend in al.dependencies:
+                    constraints.append(f"{self._get_name(al)}")
+                    edges.add((depend.signature,f"{self._get_name(al)}"))
 
+        return [('Outputs', outputs), ('Facts', facts), ('Inputs', inputs), ('Rules', rules), ('Constraints', constraints)], edges
 
-                for al in east.ast_lines+east.external_ast_lines:
-                    if al.type == ASTLineType.Fact:
-                        for define in al.define:
-                            c.node(define.signature)
-                        c.node(al.identifier)
-                c.attr(label='Facts')
+    def _definition_sections(self, lines: List[ASTLine]) -> Dict[str, str]:
+        """
+        Get the section of the nodes of a definition dependency graph (see :meth:`_definition_graph`): the section of the first line defining a node,
+        or of the first line using it for the signatures that are never defined.
 
-            with g.subgraph(name='clusterB') as c:
-                c.attr(style='filled', color='lightgrey')
-                c.node_attr.update(style='filled', color='white')
-                for al in east.ast_lines:
-                    if al.type == ASTLineType.Input:
-                        c.node(f"{al.identifier}")
-                c.attr(label='Inputs')
+        :param lines: The AST lines of the graph.
+        :return: The section of each node, in the order of the lines.
+        """
+        sections: Dict[str, str] = {}
+        used: Dict[str, str] = {}
+        for al in lines:
+            section = self._section_name(al)
+            if al.type in (ASTLineType.Output, ASTLineType.Input):
+                sections.setdefault(f"{al.identifier}", section)
+            elif al.type == ASTLineType.Constraint:
+                sections.setdefault(self._get_name(al), section)
+            elif al.type in (ASTLineType.Rule, ASTLineType.Fact):
+                for define in self._sorted(al.define):
+                    sections.setdefault(define.signature, section)
+                if al.type == ASTLineType.Fact:
+                    sections.setdefault(al.identifier, section)
+            for depend in self._sorted(al.dependencies):
+                used.setdefault(depend.signature, section)
+
+        for node, section in used.items():
+            sections.setdefault(node, section)
+        return sections
 
+    def _definition_dot(self, groups: List[Tuple[str, List[str]]], edges: Set[Tuple[str, str]], label: str = 'Definition Dependency Graph'):
+        import graphviz
 
+        g = graphviz.Digraph('G',format=self.parameters[self.name]['format'])
+        (_, outputs), *clusters = groups
+        for node in outputs:
+            g.node(node, shape='Mdiamond')
 
-            with g.subgraph(name='clusterC') as c:
+        for cluster, (cluster_label, nodes) in zip('ABCD', clusters):
+            with g.subgraph(name=f'cluster{cluster}') as c:
                 c.attr(style='filled', color='lightgrey')
                 c.node_attr.update(style='filled', color='white')
+                for node in nodes:
+                    c.node(node)
+                c.attr(label=cluster_label)
 
-                for al in east.ast_lines +east.external_ast_lines:
-                    if al.type == ASTLineType.Rule:
-                        for define in al.define:
-                            c.node(define.signature)
-                            for depend in al.dependencies:
-                                edges.add((depend.signature,define.signature))
+        g.edges(sorted(edges))
+        g.attr(label=label)
+        g.attr(fontsize='20')
+        return g
 
-                c.attr(label='Rules')
+    def _build_definition_dependency_graph(self):
+        # The graphs of the unchanged files are not rendered again, but the page still lists their section graphs
+        rendered = set(dirname for _, dirname, _ in self._views())
+        for _, dirname, east in self._views(all_views=True):
+            if east:
+                lines = east.ast_lines + east.external_ast_lines
+                groups, edges = self._definition_graph(lines, east.ast_lines)
+            else:
+                lines = self.builder.project.lines
+                groups, edges = self._definition_graph(lines, lines)
+            render = dirname in rendered
 
-            with g.subgraph(name='clusterD') as c:
-                c.attr(style='filled', color='lightgrey')
-                c.node_attr.update(style='filled', color='white')
-                for al in east.ast_lines+east.external_ast_lines:
-                    if al.type == ASTLineType.Constraint:
-                        for depend in al.dependencies:
-                            c.node(f"{al.identifier}")
-                            edges.add((depend.signature,f"{al.identifier}"))
-
-                c.attr(label='Constraints')
-            g.edges(edges)
-            g.attr(label='Definition Dependency Graph')
-            g.attr(fontsize='20')  
-            g.render(filename=os.path.join(self.parameters['doc_dir'], "img", filename_from_source(
-                self.parameters['src_dir'], east.filename).replace('.lp', ''), "ddg"), view=False)
-            
\ No newline at end of file
+            if self.parameters[self.name]['format'] == 'json':
+                if render:
+                    self._write_definition_json(groups, edges, dirname)
+                continue
+
+            nodes = set(node for _, group_nodes in groups for node in group_nodes) | set(node for edge in edges for node in edge)
+            if not self._is_large(len(nodes), len(edges)):
+                if render:
+                    self._render(self._definition_dot(groups, edges), dirname, "ddg")
+                continue
+
+            # Large-graph mode, as for the rule graph: an overview where mutually dependent predicates (then whole sections if still too large) are single nodes,
+            # and one graph for the nodes of each section
+            sections = self._definition_sections(lines)
+            names = [node for node in sections if node in nodes]
+            members: Dict[str, List[int]] = {}
+            for a, name in enumerate(names):
+                members.setdefault(sections[name], []).append(a)
+            self.definition_section_graphs[dirname] = [(section, f"ddg-{idx}") for idx, section in enumerate(members)]
+            if not render:
+                continue
+
+            index = {name: a for a, name in enumerate(names)}
+            index_edges = set((index[a], index[b]) for a, b in edges)
+            overview_names, overview_edges = self._collapse_components(names, index_edges)
+            if self._is_large(len(overview_names), len(overview_edges)):
+                overview_names, overview_edges = self._collapse_sections([sections[name] for name in names], index_edges, 'nodes')
+            self._render(self._digraph(overview_names, overview_edges, 'Definition Dependency Graph (overview)', True), dirname, "ddg",
+                         self._engine(len(overview_names), len(overview_edges)))
+
+            for (section, graph_name), section_nodes in zip(self.definition_section_graphs[dirname], members.values()):
+                position = {a: i for i, a in enumerate(section_nodes)}
+                section_edges = set((position[a], position[b]) for a, b in index_edges if a in position and b in position)
+                label = f'Definition Dependency Graph, section: {section}'
+                if self._is_large(len(section_nodes), len(section_edges)):
+                    section_names, section_edges = self._collapse_components([names[a] for a in section_nodes], section_edges)
+                    g = self._digraph(section_names, section_edges, label, True)
+                    engine = self._engine(len(section_names), len(section_edges))
+                else:
+                    # Small enough to keep the clusters of the definition graph
+                    kept = set(names[a] for a in section_nodes)
+                    g = self._definition_dot([(group, [node for node in group_nodes if node in kept]) for group, group_nodes in groups],
+                                             set((names[section_nodes[a]], names[section_nodes[b]]) for a, b in section_edges), label)
+                    engine = 'dot'
+                self._render(g, dirname, graph_name, engine)
+
+    def _write_json(self, dirname: str, name: str, title: str, groups: List[str], nodes: List[str], node_groups: List[int], edges: List[Tuple[int, int]]) -> None:
+        """
+        Write a graph in the JSON format of the viewer (see static/graph.js), instead of rendering it with graphviz.
+
+        :param dirname: The directory of the graphs of the view, see :meth:`_views`.
+        :param name: The name of the graph, "rdg" or "ddg".
+        :param title: The title of the graph.
+        :param groups: The names of the groups of nodes.
+        :param nodes: The names of the nodes.
+        :param node_groups: The index of the group of each node.
+        :param edges: The edges, as pairs of indexes in nodes.
+        """
+        import json
+
+        directory = os.path.join(self.parameters['doc_dir'], "_static", "clindoc", dirname)
+        create_dir(directory)
+        flat_edges = [node for edge in sorted(edges) for node in edge]
+        write_if_changed(os.path.join(directory, name + '.json'),
+                         json.dumps({'title': title, 'groups': groups, 'nodes': nodes, 'node_groups': node_groups, 'edges': flat_edges},
+                                    separators=(',', ':')))
+
+    def _write_definition_json(self, groups: List[Tuple[str, List[str]]], edges: Set[Tuple[str, str]], dirname: str) -> None:
+        # A node belongs to the first group it appears in, as in the DOT source
+        group_names = [label for label, _ in groups]
+        index: Dict[str, int] = {}
+        nodes, node_groups = [], []
+        for group, (_, group_nodes) in enumerate(groups):
+            for node in group_nodes:
+                if node not in index:
+                    index[node] = len(nodes)
+                    nodes.append(node)
+                    node_groups.append(group)
+
+        # Signatures only used (never defined) have no group
+        for edge in sorted(edges):
+            for node in edge:
+                if node not in index:
+                    if 'Other' not in group_names:
+                        group_names.append('Other')
+                    index[node] = len(nodes)
+                    nodes.append(node)
+                    node_groups.append(group_names.index('Other'))
+
+        self._write_json(dirname, 'ddg', 'Definition Dependency Graph', group_names, nodes, node_groups,
+                         [(index[a], index[b]) for a, b in edges])
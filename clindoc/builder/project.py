@@ -0,0 +1,85 @@
+from __future__ import annotations
+from typing import Dict, List
+
+from ..astline import ASTLine, ASTLineType
+from ..directive import Directive, DirectiveRegistry
+from ..east import EnrichedAST
+from ..graph import successors
+from .analysis import PredicateGraph
+
+
+class Project:
+    """
+    Project-wide model of the documented program, built once by the Builder and shared by every component.
+    It indexes the AST lines of all the files by the signatures they define, so that a component never compares the lines pairwise.
+    The rule dependency graph of the whole program is also built here, once: the graphs of the files are its subgraphs induced by their lines (and the lines they include).
+    The program is made of the lines of every file, and of the lines of the included files outside of the source directory.
+
+    :param easts: The EnrichedAST objects of the project.
+    :param directives: The directives of every file of the project.
+    """
+
+    def __init__(self, easts: List[EnrichedAST], directives: DirectiveRegistry) -> None:
+        self.easts = easts
+        self.directives = directives
+        self.definers: Dict[str, List[ASTLine]] = {}
+
+        # ASTLine objects are shared by the files including them, they are taken once (by identity)
+        self.lines: List[ASTLine] = [al for east in easts for al in east.ast_lines]
+        seen = set(id(al) for al in self.lines)
+        for east in easts:
+            for al in east.external_ast_lines:
+                if id(al) not in seen:
+                    seen.add(id(al))
+                    self.lines.append(al)
+
+        for al in self.lines:
+            for symbol in al.define:
+                self.definers.setdefault(symbol.signature, []).append(al)
+
+        # Rule dependency graph: an edge from each line defining a signature to the other lines depending on it
+        self.rule_lines: List[ASTLine] = [al for al in self.lines
+                                          if al.type in (ASTLineType.Rule, ASTLineType.Constraint, ASTLineType.Fact)]
+        self.rule_index: Dict[int, int] = {id(al): node for node, al in enumerate(self.rule_lines)}
+        edges = set()
+        for b, al in enumerate(self.rule_lines):
+            for symbol in al.dependencies:
+                for definer in self.get_definers(symbol.signature):
+                    a = self.rule_index.get(id(definer))
+                    if a is not None and a != b:
+                        edges.add((a, b))
+        self.rule_successors: List[List[int]] = successors(len(self.rule_lines), sorted(edges))
+        self.predicate_graph: PredicateGraph | None = None
+
+    def get_definers(self, signature: str) -> List[ASTLine]:
+        """
+        :param signature: A signature, e.g. ``sudoku/3``.
+        :return: The AST lines defining the signature, in every file.
+        """
+        return self.definers.get(signature, [])
+
+    def get_rule_nodes(self, east: EnrichedAST) -> List[int]:
+        """
+        :param east: An EnrichedAST of the project.
+        :return: The nodes of the rule dependency graph of the lines of the file and of the files it includes, in the order of the lines.
+        """
+        # Only the rules, constraints and facts are nodes
+        return [self.rule_index[id(al)] for al in east.ast_lines + east.external_ast_lines if id(al) in self.rule_index]
+
+    def get_predicate_graph(self) -> PredicateGraph:
+        """
+        :return: The predicate dependency graph of the whole program and its analysis, built on the first call.
+        """
+        if self.predicate_graph is None:
+            self.predicate_graph = PredicateGraph(self.lines)
+        return self.predicate_graph
+
+    def get_directives(self, name: str, identifier: str | None = None) -> List[Directive]:
+        """
+        :param name: The name of the directives, e.g. ``predicate`` or ``usage``.
+        :param identifier: If given, only the directives with this first parameter (e.g. a signature) are returned.
+        :return: The directives of every file, in the order of the files.
+        """
+        if identifier is None:
+            return self.directives.get(name, [])
+        return self.directives.get_all(name, identifier)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+from typing import List, Set, Tuple
+
+from ..utils import replace_if_changed
+import filecmp
+import hashlib
+import os
+import shutil
+import subprocess
+
+
+class GraphRenderer:
+    """
+    Renders graphs with the graphviz executables, in a bounded pool of jobs.
+    The DOT source of a graph is written to disk line by line, then its layout is computed by a `dot` (or another engine) process running while the next graphs are generated.
+
+    The rendered images are stored in a cache directory under the hash of their DOT source, format and engine, a graph whose source did not change is copied from the cache instead of being rendered again.
+    The DOT sources must then be generated deterministically (e.g. sorted nodes and edges) for the cache to be effective.
+    The DOT files and images are only replaced if their content changed, so that Sphinx does not read again the pages showing them.
+    The images of the cache used by a build are recorded, so that the others can be removed after a full build (see :meth:`prune`).
+
+    :param jobs: The maximum number of graphs rendered at the same time, None for the number of CPUs.
+    :param timeout: The time limit in seconds to render a graph, None for no limit.
+    :param cache_dir: The directory of the rendered images cache, None to disable it.
+    """
+
+    def __init__(self, jobs: int | None = None, timeout: float | None = None, cache_dir: str | None = None) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        # The threads only wait for the graphviz processes, which do the actual work.
+        # Without max_workers, the pool would have more threads than CPUs, and so run more graphviz processes at the same time
+        self.executor = ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1)
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.jobs: List[Tuple[str, object]] = []
+        # Filenames of the cached images used by the graphs submitted
+        self.used: Set[str] = set()
+
+    @staticmethod
+    def write_source(graph, dot_filename: str) -> str:
+        """
+        Write the DOT source of a graph, without building it as a single string.
+
+        :param graph: A graphviz.Digraph object.
+        :param dot_filename: The filename of the DOT file.
+        :return: The hash of the source, as an hexadecimal string.
+        """
+        h = hashlib.sha256()
+        with open(dot_filename + '.tmp', 'w') as file:
+            for line in graph:
+                h.update(line.encode())
+                file.write(line)
+        replace_if_changed(dot_filename + '.tmp', dot_filename)
+        return h.hexdigest()
+
+    def submit(self, dot_filename: str, output_filename: str, format: str, engine: str = 'dot', key: str | None = None) -> None:
+        """
+        Schedule the rendering of a DOT file.
+
+        :param dot_filename: The DOT file to render.
+        :param output_filename: The filename of the image.
+        :param format: The format of the image, e.g. svg.
+        :param engine: The graphviz layout engine.
+        :param key: The hash of the DOT source (see :meth:`write_source`), the cache is only used if it is given.
+        """
+        cached_filename = None
+        if self.cache_dir and key:
+            cached_filename = os.path.join(self.cache_dir, f'{key}.{engine}.{format}')
+            self.used.add(cached_filename)
+            if os.path.exists(cached_filename):
+                if not (os.path.exists(output_filename) and filecmp.cmp(cached_filename, output_filename, shallow=False)):
+                    shutil.copyfile(cached_filename, output_filename)
+                return
+
+        # Rendered next to the image, which is only replaced if it changed
+        cmd = [engine, f'-T{format}', '-o', output_filename + '.tmp', dot_filename]
+        self.jobs.append((output_filename, self.executor.submit(self._render, cmd, output_filename, cached_filename)))
+
+    def _render(self, cmd: List[str], output_filename: str, cached_filename: str | None) -> None:
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, timeout=self.timeout)
+        except (subprocess.SubprocessError, OSError):
+            if os.path.exists(output_filename + '.tmp'):
+                os.remove(output_filename + '.tmp')
+            raise
+        if cached_filename:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Written atomically, another build may read the cache at the same time
+            tmp_filename = f'{cached_filename}.{os.getpid()}.{id(cmd)}.tmp'
+            shutil.copyfile(output_filename + '.tmp', tmp_filename)
+            os.replace(tmp_filename, cached_filename)
+        replace_if_changed(output_filename + '.tmp', output_filename)
+
+    def wait(self) -> None:
+        """
+        Wait for all the scheduled renderings. A graph that fails or times out is reported, without stopping the others.
+        """
+        missing = set()
+        for output_filename, job in self.jobs:
+            try:
+                job.result()
+            except subprocess.TimeoutExpired:
+                print(f'Warning: rendering {output_filename} took more than {self.timeout}s, it was stopped')
+            except subprocess.CalledProcessError as e:
+                print(f'Warning: rendering {output_filename} failed: {e.stderr.decode(errors="replace").strip()}')
+            except FileNotFoundError as e:
+                if e.filename not in missing:
+                    missing.add(e.filename)
+                    print(f'Warning: graphviz executable {e.filename} not found, make sure Graphviz is installed and on the PATH')
+
+        self.jobs = []
+        self.executor.shutdown()
+
+    def prune(self) -> None:
+        """
+        Remove the images of the cache that were not used by the graphs submitted, so that the cache does not grow with every change of the program.
+        It must only be called once every graph of the documentation was submitted, and after :meth:`wait`.
+        """
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return
+        for filename in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, filename)
+            # The temporary files may be written by another build
+            if path not in self.used and not filename.endswith('.tmp'):
+                os.remove(path)
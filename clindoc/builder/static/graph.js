@@ -0,0 +1,376 @@
+/*
+ * Interactive viewer of the dependency graphs generated by clindoc (dependencygraph.format json).
+ *
+ * Each <div class="clindoc-graph" data-src="..."> is replaced by a viewer, the graph is only fetched when the div becomes visible.
+ * Only a part of the graph is shown at first, clicking a node shows its neighbours (lazy expansion).
+ * The canvas can be panned (drag) and zoomed (wheel), and the nodes filtered by name.
+ *
+ * Graph format: {"title": str, "groups": [str], "nodes": [str], "node_groups": [int], "edges": [source, target, source, target, ...]}
+ */
+(function () {
+    'use strict';
+
+    var MAX_INITIAL = 60;
+    var MAX_FILTER = 200;
+    var MAX_ALL = 2000;
+    var HEIGHT = 500;
+    var COLORS = ['#8dd3c7', '#fdb462', '#bebada', '#fb8072', '#80b1d3', '#b3de69', '#fccde5', '#d9d9d9'];
+
+    function Viewer(container, data) {
+        var n = data.nodes.length;
+        this.container = container;
+        this.data = data;
+        this.succ = [];
+        this.pred = [];
+        for (var i = 0; i < n; i++) {
+            this.succ.push([]);
+            this.pred.push([]);
+        }
+        for (var e = 0; e + 1 < data.edges.length; e += 2) {
+            this.succ[data.edges[e]].push(data.edges[e + 1]);
+            this.pred[data.edges[e + 1]].push(data.edges[e]);
+        }
+        // Positions of the visible nodes
+        this.visible = new Map();
+        this.scale = 1;
+        this.tx = 0;
+        this.ty = 0;
+        this.build();
+        this.reset();
+    }
+
+    Viewer.prototype.build = function () {
+        var self = this;
+        this.container.innerHTML = '';
+
+        var toolbar = document.createElement('div');
+        toolbar.style.margin = '4px 0';
+        var input = document.createElement('input');
+        input.type = 'search';
+        input.placeholder = 'Filter nodes';
+        input.addEventListener('input', function () { self.filter(input.value); });
+        toolbar.appendChild(input);
+        toolbar.appendChild(this.button('Reset', function () { input.value = ''; self.reset(); }));
+        var all = this.button('Show all', function () { self.showAll(); });
+        all.disabled = this.data.nodes.length > MAX_ALL;
+        toolbar.appendChild(all);
+        this.info = document.createElement('span');
+        this.info.style.marginLeft = '8px';
+        toolbar.appendChild(this.info);
+        this.container.appendChild(toolbar);
+
+        this.canvas = document.createElement('canvas');
+        this.canvas.style.width = '100%';
+        this.canvas.style.height = HEIGHT + 'px';
+        this.canvas.style.border = '1px solid #ccc';
+        this.canvas.style.cursor = 'grab';
+        this.container.appendChild(this.canvas);
+        this.context = this.canvas.getContext('2d');
+
+        var drag = null;
+        this.canvas.addEventListener('mousedown', function (event) {
+            drag = {x: event.clientX, y: event.clientY, moved: false};
+        });
+        window.addEventListener('mousemove', function (event) {
+            if (!drag) {
+                return;
+            }
+            var dx = event.clientX - drag.x;
+            var dy = event.clientY - drag.y;
+            if (Math.abs(dx) + Math.abs(dy) > 2) {
+                drag.moved = true;
+            }
+            self.tx += dx;
+            self.ty += dy;
+            drag.x = event.clientX;
+            drag.y = event.clientY;
+            self.draw();
+        });
+        window.addEventListener('mouseup', function (event) {
+            if (drag && !drag.moved && event.target === self.canvas) {
+                var node = self.nodeAt(event);
+                if (node !== null) {
+                    self.expand(node);
+                }
+            }
+            drag = null;
+        });
+        this.canvas.addEventListener('wheel', function (event) {
+            event.preventDefault();
+            var rect = self.canvas.getBoundingClientRect();
+            var x = event.clientX - rect.left;
+            var y = event.clientY - rect.top;
+            var factor = event.deltaY < 0 ? 1.2 : 1 / 1.2;
+            // The point under the cursor does not move
+            self.tx = x - (x - self.tx) * factor;
+            self.ty = y - (y - self.ty) * factor;
+            self.scale *= factor;
+            self.draw();
+        }, {passive: false});
+    };
+
+    Viewer.prototype.button = function (label, callback) {
+        var button = document.createElement('button');
+        button.type = 'button';
+        button.textContent = label;
+        button.style.marginLeft = '4px';
+        button.addEventListener('click', callback);
+        return button;
+    };
+
+    Viewer.prototype.show = function (nodes) {
+        this.visible = new Map();
+        var columns = Math.ceil(Math.sqrt(nodes.length));
+        for (var i = 0; i < nodes.length; i++) {
+            this.visible.set(nodes[i], {x: (i % columns) * 150, y: Math.floor(i / columns) * 80});
+        }
+        // The layout is quadratic in the number of nodes, fewer iterations for large graphs
+        this.layout(Math.max(10, Math.min(150, Math.floor(4000000 / (nodes.length * nodes.length + 1)))));
+        this.fit();
+    };
+
+    Viewer.prototype.reset = function () {
+        var nodes = [];
+        // The nodes without predecessor first, they are the inputs of the program
+        for (var i = 0; i < this.data.nodes.length && nodes.length < MAX_INITIAL; i++) {
+            if (this.pred[i].length === 0) {
+                nodes.push(i);
+            }
+        }
+        for (var j = 0; j < this.data.nodes.length && nodes.length < MAX_INITIAL; j++) {
+            if (this.pred[j].length !== 0) {
+                nodes.push(j);
+            }
+        }
+        this.show(nodes);
+    };
+
+    Viewer.prototype.filter = function (text) {
+        text = text.trim().toLowerCase();
+        if (!text) {
+            this.reset();
+            return;
+        }
+        var nodes = [];
+        for (var i = 0; i < this.data.nodes.length && nodes.length < MAX_FILTER; i++) {
+            if (this.data.nodes[i].toLowerCase().indexOf(text) !== -1) {
+                nodes.push(i);
+            }
+        }
+        this.show(nodes);
+    };
+
+    Viewer.prototype.showAll = function () {
+        var nodes = [];
+        for (var i = 0; i < this.data.nodes.length && i < MAX_ALL; i++) {
+            nodes.push(i);
+        }
+        this.show(nodes);
+    };
+
+    Viewer.prototype.expand = function (node) {
+        var origin = this.visible.get(node);
+        var neighbours = this.pred[node].concat(this.succ[node]);
+        var added = 0;
+        for (var i = 0; i < neighbours.length; i++) {
+            if (!this.visible.has(neighbours[i])) {
+                var angle = 2 * Math.PI * added / neighbours.length;
+                this.visible.set(neighbours[i], {x: origin.x + 120 * Math.cos(angle), y: origin.y + 120 * Math.sin(angle)});
+                added++;
+            }
+        }
+        if (added) {
+            this.layout(60);
+        }
+        this.draw();
+    };
+
+    // Force-directed layout of the visible nodes: they repel each other, and the visible edges pull their ends together
+    Viewer.prototype.layout = function (iterations) {
+        var nodes = Array.from(this.visible.keys());
+        var positions = nodes.map(function (node) { return this.visible.get(node); }, this);
+        var index = new Map(nodes.map(function (node, i) { return [node, i]; }));
+        var edges = [];
+        for (var i = 0; i < nodes.length; i++) {
+            var succ = this.succ[nodes[i]];
+            for (var k = 0; k < succ.length; k++) {
+                if (index.has(succ[k])) {
+                    edges.push([i, index.get(succ[k])]);
+                }
+            }
+        }
+
+        for (var step = 0; step < iterations; step++) {
+            var temperature = 20 * (1 - step / iterations) + 1;
+            var forces = positions.map(function () { return {x: 0, y: 0}; });
+            for (var a = 0; a < positions.length; a++) {
+                for (var b = a + 1; b < positions.length; b++) {
+                    var dx = positions[a].x - positions[b].x;
+                    var dy = positions[a].y - positions[b].y;
+                    var distance2 = Math.max(dx * dx + dy * dy, 1);
+                    var repulsion = 20000 / distance2;
+                    forces[a].x += dx * repulsion / Math.sqrt(distance2);
+                    forces[a].y += dy * repulsion / Math.sqrt(distance2);
+                    forces[b].x -= dx * repulsion / Math.sqrt(distance2);
+                    forces[b].y -= dy * repulsion / Math.sqrt(distance2);
+                }
+            }
+            for (var e = 0; e < edges.length; e++) {
+                var source = positions[edges[e][0]];
+                var target = positions[edges[e][1]];
+                var ex = target.x - source.x;
+                var ey = target.y - source.y;
+                forces[edges[e][0]].x += ex * 0.05;
+                forces[edges[e][0]].y += ey * 0.05;
+                forces[edges[e][1]].x -= ex * 0.05;
+                forces[edges[e][1]].y -= ey * 0.05;
+                // Edges point downwards when possible
+                forces[edges[e][1]].y += 2;
+                forces[edges[e][0]].y -= 2;
+            }
+            for (var p = 0; p < positions.length; p++) {
+                var length = Math.sqrt(forces[p].x * forces[p].x + forces[p].y * forces[p].y);
+                if (length > 0) {
+                    var move = Math.min(length, temperature);
+                    positions[p].x += forces[p].x / length * move;
+                    positions[p].y += forces[p].y / length * move;
+                }
+            }
+        }
+    };
+
+    Viewer.prototype.fit = function () {
+        var width = this.canvas.clientWidth || 800;
+        var minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
+        this.visible.forEach(function (position) {
+            minX = Math.min(minX, position.x);
+            minY = Math.min(minY, position.y);
+            maxX = Math.max(maxX, position.x);
+            maxY = Math.max(maxY, position.y);
+        });
+        if (minX === Infinity) {
+            this.scale = 1;
+            this.tx = 0;
+            this.ty = 0;
+        } else {
+            this.scale = Math.min(2, (width - 100) / Math.max(maxX - minX, 1), (HEIGHT - 60) / Math.max(maxY - minY, 1));
+            this.tx = 50 - minX * this.scale + Math.max(0, (width - 100 - (maxX - minX) * this.scale) / 2);
+            this.ty = 30 - minY * this.scale;
+        }
+        this.draw();
+    };
+
+    Viewer.prototype.nodeAt = function (event) {
+        var rect = this.canvas.getBoundingClientRect();
+        var x = (event.clientX - rect.left - this.tx) / this.scale;
+        var y = (event.clientY - rect.top - this.ty) / this.scale;
+        var found = null;
+        var context = this.context;
+        var labels = this.data.nodes;
+        this.visible.forEach(function (position, node) {
+            var half = context.measureText(labels[node]).width / 2 + 6;
+            if (Math.abs(x - position.x) <= half && Math.abs(y - position.y) <= 12) {
+                found = node;
+            }
+        });
+        return found;
+    };
+
+    Viewer.prototype.draw = function () {
+        var canvas = this.canvas;
+        var ratio = window.devicePixelRatio || 1;
+        canvas.width = canvas.clientWidth * ratio;
+        canvas.height = HEIGHT * ratio;
+        var context = this.context;
+        context.setTransform(ratio, 0, 0, ratio, 0, 0);
+        context.clearRect(0, 0, canvas.width, canvas.height);
+        context.translate(this.tx, this.ty);
+        context.scale(this.scale, this.scale);
+        context.font = '12px sans-serif';
+        context.textAlign = 'center';
+        context.textBaseline = 'middle';
+
+        var visible = this.visible;
+        var succ = this.succ;
+        var hidden = 0;
+        context.strokeStyle = '#888';
+        context.fillStyle = '#888';
+        visible.forEach(function (source, node) {
+            for (var k = 0; k < succ[node].length; k++) {
+                var target = visible.get(succ[node][k]);
+                if (!target) {
+                    continue;
+                }
+                context.beginPath();
+                context.moveTo(source.x, source.y);
+                context.lineTo(target.x, target.y);
+                context.stroke();
+                // Arrow head, at the middle of the edge
+                var angle = Math.atan2(target.y - source.y, target.x - source.x);
+                var mx = (source.x + target.x) / 2;
+                var my = (source.y + target.y) / 2;
+                context.beginPath();
+                context.moveTo(mx + 6 * Math.cos(angle), my + 6 * Math.sin(angle));
+                context.lineTo(mx - 6 * Math.cos(angle - 0.5), my - 6 * Math.sin(angle - 0.5));
+                context.lineTo(mx - 6 * Math.cos(angle + 0.5), my - 6 * Math.sin(angle + 0.5));
+                context.fill();
+            }
+        });
+
+        var data = this.data;
+        var pred = this.pred;
+        visible.forEach(function (position, node) {
+            var label = data.nodes[node];
+            var width = context.measureText(label).width + 12;
+            var neighbours = pred[node].concat(succ[node]);
+            var collapsed = neighbours.some(function (neighbour) { return !visible.has(neighbour); });
+            if (collapsed) {
+                hidden++;
+            }
+            context.fillStyle = COLORS[data.node_groups[node] % COLORS.length];
+            context.fillRect(position.x - width / 2, position.y - 11, width, 22);
+            context.strokeStyle = collapsed ? '#000' : '#666';
+            context.setLineDash(collapsed ? [4, 2] : []);
+            context.strokeRect(position.x - width / 2, position.y - 11, width, 22);
+            context.setLineDash([]);
+            context.fillStyle = '#000';
+            context.fillText(label, position.x, position.y);
+        });
+
+        this.info.textContent = visible.size + ' / ' + data.nodes.length + ' nodes shown' +
+            (hidden ? ', click a dashed node to show its neighbours' : '');
+    };
+
+    function load(container) {
+        fetch(container.getAttribute('data-src'))
+            .then(function (response) { return response.json(); })
+            .then(function (data) { new Viewer(container, data); })
+            .catch(function (error) {
+                container.textContent = 'Could not load the graph (' + error + '). The documentation must be served over HTTP, e.g. with python -m http.server.';
+            });
+    }
+
+    function init() {
+        var containers = document.querySelectorAll('div.clindoc-graph');
+        if (!('IntersectionObserver' in window)) {
+            containers.forEach(load);
+            return;
+        }
+        // Graphs are only fetched and laid out when they are scrolled into view
+        var observer = new IntersectionObserver(function (entries) {
+            entries.forEach(function (entry) {
+                if (entry.isIntersecting) {
+                    observer.unobserve(entry.target);
+                    load(entry.target);
+                }
+            });
+        });
+        containers.forEach(function (container) { observer.observe(container); });
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+})();
@@ -5,6 +5,7 @@ from argparse import ArgumentParser
 class UserDocumentation(Component):
     parse_group_description = 'User Documentation parameters'
     name = 'userdoc'
+    reads = ('project',)
 
     @classmethod
     def cmdline_documentation(cls, parser: ArgumentParser):
@@ -28,16 +29,13 @@ class UserDocumentation(Component):
         self._build_usage()
 
     def _build_usage(self):
-        directives= {}
-        for east in self.builder.easts:
-            directives.update(east.directives)
+        project = self.builder.project
 
-
-        if directives.get('installation'):
+        if project.get_directives('installation'):
             self.document.h2('Installation')
             self.document.newline()
             
-            for directive in directives.get('installation'):
+            for directive in project.get_directives('installation'):
                 self.document.content(directive.description)
                 self.document.newline()
 
@@ -45,11 +43,11 @@ class UserDocumentation(Component):
                 self.document.newline(3 )
 
         
-        if directives.get('usage'):
+        if project.get_directives('usage'):
             self.document.h2('Usage')
             self.document.newline()
             
-            for directive in directives.get('usage'):
+            for directive in project.get_directives('usage'):
                 self.document.content(directive.description)
                 self.document.newline()
                 self.document.directive('code-block',content=directive.parameters[0],arg = directive.parameters[1],indent=2)
@@ -57,13 +55,13 @@ class UserDocumentation(Component):
 
         
 
-        if directives.get('example'):
+        if project.get_directives('example'):
             self.document.newline()
 
             self.document.h2('Example')
             self.document.newline()
             
-            for directive in directives.get('example'):
+            for directive in project.get_directives('example'):
                 self.document.content(directive.description)
                 self.document.newline()
                 self.document.directive('code-block',content=directive.parameters[0],arg = directive.parameters[1],indent=2)
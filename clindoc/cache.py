@@ -0,0 +1,90 @@
+from __future__ import annotations
+from typing import Dict
+import hashlib
+import os
+import pickle
+
+from .east import EnrichedAST
+
+
+class AnalysisCache:
+    """
+    On-disk cache of the analysis of the source files, stored in the `.clindoc-cache` folder of the documentation directory.
+    Each file has one entry holding its EnrichedAST object (without the clingo AST nodes), which is only reused if the key of the entry still matches.
+    The key is a hash of the content of the file, the version of clindoc and the parameters used during the analysis.
+
+    :param parameters: A dictionary of parameters for the Clindoc object.
+    :param version: The version of clindoc, entries written by another version (or another FORMAT) are ignored.
+    """
+
+    DIRNAME = '.clindoc-cache'
+    # Version of the layout of the cached objects, to be increased when the analysis classes change
+    FORMAT = 8
+    # Parameters changing the result of the analysis
+    ANALYSIS_PARAMETERS = ['fact_files', 'fact_file_size', 'fact_sample']
+
+    def __init__(self, parameters: Dict, version: str) -> None:
+        self.parameters = parameters
+        self.version = version
+        self.directory = os.path.join(parameters['doc_dir'], self.DIRNAME, 'analysis')
+
+    def key(self, filename: str, content: bytes | None = None) -> str:
+        """
+        Compute the key of a file.
+
+        :param filename: The filename of the file.
+        :param content: The content of the file, if it was already read. Otherwise the file is read by chunks.
+        :return: The key as an hexadecimal string.
+        """
+        h = hashlib.sha256()
+        # The prefixes of the AST lines depend on src_dir
+        parameters = [self.parameters['src_dir']] + [repr(self.parameters.get(name)) for name in self.ANALYSIS_PARAMETERS]
+        for part in [self.version, str(self.FORMAT), filename] + parameters:
+            h.update(part.encode())
+            h.update(b'\0')
+
+        if content is None:
+            with open(filename, 'rb') as file:
+                for chunk in iter(lambda: file.read(1 << 20), b''):
+                    h.update(chunk)
+        else:
+            h.update(content)
+        return h.hexdigest()
+
+    def _entry_filename(self, filename: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(filename.encode()).hexdigest() + '.pickle')
+
+    def load(self, filename: str, key: str) -> EnrichedAST | None:
+        """
+        Get the cached EnrichedAST of a file.
+
+        :param filename: The filename of the file.
+        :param key: The current key of the file, see :meth:`key`.
+        :return: The cached EnrichedAST object, or None if there is no entry matching the key.
+        """
+        try:
+            with open(self._entry_filename(filename), 'rb') as file:
+                entry_key, east = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+
+        if entry_key != key:
+            return None
+
+        east.parameters = self.parameters
+        return east
+
+    def store(self, east: EnrichedAST, key: str) -> None:
+        """
+        Write the entry of a file, replacing the previous one.
+
+        :param east: The EnrichedAST of the file.
+        :param key: The key of the file that was analyzed, see :meth:`key`.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        entry_filename = self._entry_filename(east.filename)
+        # Files may be loaded by several processes, the entry is written atomically
+        tmp_filename = f'{entry_filename}.{os.getpid()}.tmp'
+        with open(tmp_filename, 'wb') as file:
+            pickle.dump((key, east), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_filename, entry_filename)
@@ -1,17 +1,26 @@
-from clingo import Control
-from clingo.ast import ProgramBuilder, parse_files
-from sphinx.application import Sphinx
-from typing import List, Dict
+from __future__ import annotations
+from itertools import repeat
+from typing import List, Dict, Set, Tuple, TYPE_CHECKING
 
 from .east import EnrichedAST
 from .builder import Builder
+from .cache import AnalysisCache
+from .facts import FactFile
+from .watcher import Watcher
 from .utils import create_dir, get_dir_filename
 from .astline import Constraint
+from .comment import Comment
 
 import os
+import re
 import shutil
 import json
 
+# clingo, Sphinx, rstcloth and graphviz are only imported by the stage that uses them,
+# so that the command line (e.g. --help, --version) starts quickly
+if TYPE_CHECKING:
+    from clingo.ast import AST
+
 """
 Clindoc (CLIngo DOCumentation) is a tool that provides a way to generate documentation from logic programs written in the ASP (Answer Set Programming => Clingo) language. 
 It takes a directory containing .lp files as input and generates an output directory containing the documentation in a specified format (e.g HTML). 
@@ -38,6 +47,13 @@ class Clindoc:
     | no_sphinx_build | (bool) | Whether to run the Sphinx build command after generating the reStructuredText files. If not provided, it defaults to False.                 |
     | no_rst_build    | (bool) | Whether to generate reStructuredText files or not. If not provided, it defaults to False.                                                   |
     | description     | (str)  | The description of the project. If not provided, it defaults to 'Default description'.                                                      |
+    | no_cache        | (bool) | Whether to analyze every file again instead of reusing the cache of <doc_dir>/.clindoc-cache. If not provided, it defaults to False.        |
+    | watch           | (bool) | Whether to keep watching src_dir and update the documentation when a file changes. If not provided, it defaults to False.                   |
+    | watch_interval  | (float)| Time in seconds between two checks of src_dir in watch mode. If not provided, it defaults to 1.                                             |
+    | fact_files      | (list) | Glob patterns (relative to src_dir) of the data files, summarized per signature instead of being parsed. Defaults to [].                    |
+    | fact_file_size  | (int)  | Size in bytes above which a file is tried as a data file, 0 disables it. If not provided, it defaults to 0.                                 |
+    | fact_sample     | (int)  | Number of facts of each signature shown for a data file. If not provided, it defaults to 5.                                                 |
+    | jobs            | (int)  | Number of processes used to load the source files, 0 uses every available core. If not provided, it defaults to 1.                          |
     | conf_filename   | (str)  | The path to a JSON configuration file. If provided, the options in the file will overwrite the options provided in the parameters argument. |
     | dump_conf       | (str)  | If provided, the current configuration will be dumped to the given file in JSON format.                                                     |
     
@@ -45,6 +61,8 @@ class Clindoc:
     
     """
     VERSION = "0.3.0"
+    # The comments and strings are matched too (see Comment.TOKEN_PATTERN), so that the include statements they contain are skipped
+    INCLUDE_PATTERN = re.compile(r'(?P<include>#include\s*"(?P<path>[^"\n]*)"\s*\.)|' + Comment.TOKEN_PATTERN.pattern, re.DOTALL)
 
     def __init__(self, parameters: Dict = {}) -> None:
         # Change filenames to absolute filenames, set default values ...
@@ -54,10 +72,15 @@ class Clindoc:
     def load_folder(cls, parameters) -> List[EnrichedAST]:    
         """
         Load all .lp files in the given folder (recursively) and create EnrichedAST objects for each file.
+        If `parameters['jobs']` is different from 1, the files are loaded in parallel by a pool of processes. 
+        The EnrichedAST objects are then returned without their clingo AST nodes, as those cannot cross process boundaries.
+
+        Every file is parsed exactly once: files pulled in by an `#include` statement are loaded on their own (even if they are outside of the folder),
+        and their AST lines are shared with every file including them.
 
         :param filename: The filename of the folder to load files from.
         :param parameters: A dictionary of parameters for the Clindoc object.
-        :return: A list of EnrichedAST objects. 
+        :return: A list of EnrichedAST objects, in a deterministic order. 
         """
         ret = []
 
@@ -66,33 +89,146 @@ class Clindoc:
             raise ValueError(f"{filename} is not a valid directory.")
         lp_filenames = []
         for root, dirs, files in os.walk(filename):
+            dirs.sort()
             lp_filenames.extend([os.path.join(root, f)
-                            for f in files if f.endswith(".lp")])
+                            for f in sorted(files) if f.endswith(".lp")])
+
+        jobs = parameters.get('jobs', 1)
+        if jobs != 1 and len(lp_filenames) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+                ret = list(executor.map(cls.load_file, lp_filenames, repeat(parameters)))
+            # Each EnrichedAST came back with its own copy of the parameters
+            for east in ret:
+                east.parameters = parameters
+        else:
+            for lp_filename in lp_filenames:
+                ret.append(cls.load_file(lp_filename, parameters))
 
-        for lp_filename in lp_filenames:
-            ret.append(cls.load_file(lp_filename, parameters))
+        cls.link_includes(ret, parameters)
 
         return ret
 
+    @classmethod
+    def link_includes(cls, easts: List[EnrichedAST], parameters) -> None:
+        """
+        Link every EnrichedAST to the AST lines of the files it includes.
+        Included files that are not part of the given list are loaded only to be linked.
+
+        :param easts: A list of EnrichedAST objects.
+        :param parameters: A dictionary of parameters for the Clindoc object.
+        """
+        loaded = {east.filename: east for east in easts}
+        to_load = [include for east in easts for include in east.includes]
+        while to_load:
+            include = to_load.pop()
+            if include not in loaded:
+                loaded[include] = cls.load_file(include, parameters)
+                to_load.extend(loaded[include].includes)
+
+        for east in easts:
+            east.link_includes(loaded)
+
     @classmethod
     def load_file(cls, filename, parameters):
         """
         Load the given file and create an EnrichedAST object for it.
+        The lines of the files it includes are not part of it, see :meth:`EnrichedAST.link_includes`.
+        Data files are summarized as a :class:`FactFile` when possible.
+        Unless `parameters['no_cache']` is set, the analysis is read from (or written to) the cache of the documentation directory, see :class:`AnalysisCache`.
 
         :param filename: The filename of the file to load.
         :param parameters: A dictionary of parameters for the Clindoc object.
         :return: An EnrichedAST object.
         """
-        Constraint.id = 0
-        ctl = Control()
-        with open(filename) as f:
-            file_lines = f.readlines()
+        # Fact files are read by chunks, they are not loaded in memory
+        content = None
+        fact_file = FactFile.is_candidate(filename, parameters)
+        if not fact_file:
+            with open(filename, 'rb') as f:
+                content = f.read()
+
+        cache = None
+        if not parameters.get('no_cache'):
+            cache = AnalysisCache(parameters, cls.VERSION)
+            key = cache.key(filename, content)
+            east = cache.load(filename, key)
+            if east:
+                return east
+
+        east = None
+        if fact_file:
+            east = FactFile.from_file(filename, parameters)
+            if east is None:
+                if FactFile.matches_patterns(filename, parameters):
+                    print(f'Warning: {filename} does not only contain facts, it is parsed as an encoding')
+                with open(filename, 'rb') as f:
+                    content = f.read()
+
+        if east is None:
+            Constraint.counter = 0
+            file_lines, ast_list, includes = cls.parse_program(filename, content.decode())
+            east = EnrichedAST(ast_list, file_lines, filename, parameters, includes)
+
+        if cache:
+            cache.store(east, key)
+
+        return east
+
+    @classmethod
+    def parse_program(cls, filename: str, content: str) -> Tuple[List[str], List[AST], List[str]]:
+        """
+        Parse the content of the given file, without expanding its `#include` statements.
+        The include statements are blanked out before parsing (so the locations are preserved), and the files they target are returned instead.
+
+        .. note:
+            Only the locations of the statements are set to the given filename, the nested AST nodes keep the filename given by clingo to parsed strings.
+
+        :param filename: The filename of the file to parse.
+        :param content: The content of the file.
+        :return: The lines of the file, the list of its statements, and the absolute filenames of the files it includes.
+        """
+        from clingo.ast import Location, parse_string
+
+        includes = []
+        def blank_include(match: re.Match) -> str:
+            if match['include'] is None:
+                # A comment or a string
+                return match[0]
+            includes.append(cls.resolve_include(match['path'], filename))
+            return re.sub(r'[^\n]', ' ', match[0])
+        program = cls.INCLUDE_PATTERN.sub(blank_include, content)
 
         ast_list = []
-        with ProgramBuilder(ctl) as _:
-            parse_files([filename], ast_list.append)
+        def relocate(ast: AST):
+            begin, end = ast.location
+            ast_list.append(ast.update(location=Location(begin._replace(filename=filename),
+                                                         end._replace(filename=filename))))
+        parse_string(program, relocate)
+
+        # Only '\n' ends a line for clingo, str.splitlines would also split on '\x0c', '\x85', '\u2028'... and shift the rows
+        lines = [line + '\n' for line in content.split('\n')]
+        lines[-1] = lines[-1][:-1]
+        if not lines[-1]:
+            lines.pop()
+        return lines, ast_list, includes
 
-        return EnrichedAST(ast_list, file_lines, filename, parameters)
+    @classmethod
+    def resolve_include(cls, path: str, filename: str) -> str:
+        """
+        Find the file targeted by an `#include` statement, as clingo does: relatively to the including file, then to the working directory.
+
+        :param path: The path given to the `#include` statement.
+        :param filename: The filename of the including file.
+        :return: The absolute filename of the included file.
+        :raises ValueError: If the included file does not exist.
+        """
+        for candidate in [os.path.join(os.path.dirname(filename), path), path]:
+            if os.path.isfile(candidate):
+                return os.path.abspath(candidate)
+
+        raise ValueError(f'{path} included in {filename} could not be found')
 
     
     def check_parameters(self, parameters: Dict):
@@ -139,9 +275,32 @@ class Clindoc:
         if not 'no_rst_build' in parameters:
             parameters['no_rst_build'] = False
 
+        if not 'no_cache' in parameters:
+            parameters['no_cache'] = False
+
         if not 'description' in parameters:
             parameters['description'] = 'Default description'
 
+        if not 'watch' in parameters:
+            parameters['watch'] = False
+
+        if not 'watch_interval' in parameters:
+            parameters['watch_interval'] = 1.0
+
+        if not 'fact_files' in parameters or parameters['fact_files'] is None:
+            parameters['fact_files'] = []
+
+        if not 'fact_file_size' in parameters:
+            parameters['fact_file_size'] = 0
+
+        if not 'fact_sample' in parameters:
+            parameters['fact_sample'] = 5
+
+        if not 'jobs' in parameters:
+            parameters['jobs'] = 1
+        elif parameters['jobs'] < 0:
+            raise ValueError(f"invalid jobs value: {parameters['jobs']}")
+
         if not 'conf_filename' in parameters:
             parameters['conf_filename'] = None
         else:
@@ -161,12 +320,7 @@ class Clindoc:
         """
         Build the documentation and then pass it to Sphinx
         """
-        self.easts: List[EnrichedAST] = self.load_folder(
-            self.parameters)
-
-        if len(self.easts) == 0:
-            raise ValueError(f'Empty {self.parameters["src_dir"]} folder')
-
+        # Cleaning first, the analysis cache is stored in doc_dir
         if self.parameters['clean']:
             if os.path.exists(self.parameters['doc_dir']):
                 shutil.rmtree(self.parameters['doc_dir'])
@@ -174,6 +328,12 @@ class Clindoc:
             if os.path.exists(self.parameters['out_dir']):
                 shutil.rmtree(self.parameters['out_dir'])
 
+        self.easts: List[EnrichedAST] = self.load_folder(
+            self.parameters)
+
+        if len(self.easts) == 0:
+            raise ValueError(f'Empty {self.parameters["src_dir"]} folder')
+
         create_dir(self.parameters['doc_dir'])
         create_dir(self.parameters['out_dir'])
 
@@ -186,6 +346,61 @@ class Clindoc:
             with open(self.parameters['dump_conf'], 'w') as file:
                 file.write(json.dumps(self.parameters, indent=4))
 
+        self.build_sphinx()
+
+    def update_documentation(self, changed: Set[str]) -> None:
+        """
+        Update the documentation after some source files changed.
+        Only the changed files are analyzed again, and only the outputs depending on them (or on the files including them) are regenerated.
+        If files were added or removed, the whole folder is loaded again (unchanged files are then read from the cache).
+
+        :param changed: The filenames of the modified, added or removed files.
+        """
+        easts = {east.filename: east for east in self.easts}
+        if all(filename in easts and os.path.exists(filename) for filename in changed):
+            for filename in changed:
+                easts[filename] = self.load_file(filename, self.parameters)
+            self.easts = [easts[east.filename] for east in self.easts]
+            self.link_includes(self.easts, self.parameters)
+
+            dirty = {east.filename for east in self.easts
+                     if east.filename in changed or changed.intersection(east.included_files)}
+        else:
+            self.easts = self.load_folder(self.parameters)
+            dirty = None
+
+        self.builder = Builder(self.easts, self.parameters)
+
+        if not self.parameters['no_rst_build']:
+            self.builder.build(dirty)
+
+        self.build_sphinx()
+
+    def watch(self) -> None:
+        """
+        Build the documentation, then keep watching the source directory and update the documentation each time a file changes, until interrupted.
+        """
+        self.build_documentation()
+
+        watcher = Watcher(self.parameters['src_dir'], self.parameters['watch_interval'])
+        print(f'Watching {self.parameters["src_dir"]} (press Ctrl+C to stop)')
+        try:
+            while True:
+                changed = watcher.wait()
+                print(f'Changed: {", ".join(sorted(changed))}')
+                try:
+                    self.update_documentation(changed)
+                except (ValueError, RuntimeError) as e:
+                    # Typically a syntax error while the file is being edited, wait for the next change
+                    print(f'Error: {e}')
+        except KeyboardInterrupt:
+            pass
+
+    def build_sphinx(self) -> None:
+        """
+        Pass the documentation to Sphinx, unless `no_sphinx_build` is set.
+        The doctrees are kept in <out_dir>/pickle, so Sphinx only reads again the files that changed since the previous build.
+        """
         sphinx_config = {
             "project": self.parameters['project_name'],
             "html_theme": "sphinx_rtd_theme",
@@ -198,7 +413,14 @@ class Clindoc:
                 'sphinx.ext.intersphinx'
             ]
         }
+        # Files generated for the html pages, e.g. the graphs of dependencygraph.format json
+        static_dir = os.path.abspath(os.path.join(self.parameters['doc_dir'], '_static'))
+        if os.path.isdir(static_dir):
+            sphinx_config['html_static_path'] = [static_dir]
+
         if not self.parameters.get('no_sphinx_build'):
+            from sphinx.application import Sphinx
+
             s = Sphinx(self.parameters['doc_dir'],
                        confdir=None,
                        outdir=self.parameters['out_dir'],
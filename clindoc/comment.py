@@ -1,11 +1,17 @@
 from __future__ import annotations
-from clingo.ast import Location, Position
-from typing import List
+from typing import List, TYPE_CHECKING
+import re
 
-from .utils import parse_content_from_location
+if TYPE_CHECKING:
+    from clingo.ast import Location
 
 
 class Comment:
+    # Strings are matched to skip the '%' they contain, unterminated strings and block comments stop at the end of the line and of the file
+    TOKEN_PATTERN = re.compile(r'"(?:[^"\\\n]|\\.)*"?|%\*(?P<block>.*?)(?:\*%|\Z)|%(?P<line>[^\n]*\n?)', re.DOTALL)
+
+    __slots__ = ('location', 'large_comment', 'content')
+
     def __init__(self, location:Location, large_comment:bool, content:str) -> None:
         self.location = location
         self.large_comment = large_comment
@@ -13,31 +19,50 @@ class Comment:
 
     @classmethod
     def extract_comments(cls, file:List[str], filename=str) -> List[Comment]:
-        in_comment = False 
+        """
+        Extracts the line comments (``%``) and block comments (``%* ... *%``) of a file.
+        The file is scanned from one token to the next with a single regular expression, the content of a comment being one slice of the file.
+
+        :param file: The lines of the file.
+        :param filename: The filename of the file.
+        :return: The comments, in the order of the file.
+        """
+        from clingo.ast import Location, Position
+
+        text = ''.join(file)
         comments = []
-        begin = None
-        for idx_row,line in enumerate(file):
-            for idx_column, char in enumerate(line):
-                
-                if char == "%" and not in_comment:
-                    begin = Position(filename,idx_row,idx_column+1)
-                    if idx_column < len(line) and line[idx_column+1] == '*':
-                        in_comment = True
-                    else:
-                        location = Location(begin,Position(filename,idx_row,len(line)))
-                        content = parse_content_from_location(file,location)
-                        comments.append(Comment(location,False,content))
-                        
-                if char == '*' and in_comment:
-                    if idx_column < len(line) and line[idx_column+1] == '%':
-                        in_comment = False
-                        
-                        location = Location(begin,Position(filename,idx_row,idx_column-1))
-                        content = parse_content_from_location(file,location)
-                        comments.append(Comment(location, True, content))
-                          
+        row = 0
+        row_start = 0
+        last = 0
+        for match in cls.TOKEN_PATTERN.finditer(text):
+            group = match.lastgroup
+            if group is None:
+                continue
+
+            start = match.start()
+            newlines = text.count('\n', last, start)
+            if newlines:
+                row += newlines
+                row_start = text.rindex('\n', last, start) + 1
+            last = start
+
+            # The column of a comment is the one following the '%'
+            begin = Position(filename, row, start - row_start + 1)
+            content = match[group]
+            if group == 'block':
+                end_offset = match.end(group)
+                newlines = text.count('\n', last, end_offset)
+                if newlines:
+                    row += newlines
+                    row_start = text.rindex('\n', last, end_offset) + 1
+                last = end_offset
+                location = Location(begin, Position(filename, row, end_offset - row_start))
+            else:
+                location = Location(begin, Position(filename, row, len(file[row])))
+            comments.append(Comment(location, group == 'block', content))
+
         return comments
-    
-    
+
+
     def __repr__(self) -> str:
-        return self.content
\ No newline at end of file
+        return self.content
@@ -1,7 +1,10 @@
 from __future__ import annotations
-from typing import List, Union
+from typing import Dict, Iterable, List, Tuple, Union, TYPE_CHECKING
 import re
 
+if TYPE_CHECKING:
+    from .comment import Comment
+
 
 class Directive:
     """
@@ -20,6 +23,10 @@ class Directive:
 
     DIRECTIVE_IDENTIFIER = "@"
     DESCRIPTION_IDENTIFIER = "->"
+    __slots__ = ('name', 'parameters', 'description', 'line_number', 'filename')
+
+    DIRECTIVE_PATTERN = re.compile(
+        rf" *{DIRECTIVE_IDENTIFIER} *(?P<directive_name>[a-zA-Z]+) *\((?P<parameters>[^\-\>]*)\) *({DESCRIPTION_IDENTIFIER} *(?P<description>[^\n]*))?")
 
     def __init__(self,
                  name: str,
@@ -47,6 +54,10 @@ class Directive:
         :param filename: The filename of the file where the directive was found.
         :return: A `Directive` object representing the directive found in the line, or None if no directive was found.
         """
+        # Most lines have no directive, they are rejected before running the pattern
+        if not cls.DIRECTIVE_IDENTIFIER in line:
+            return
+
         def _extract_parameters(s):
             result = []
             current_word = ""
@@ -73,8 +84,7 @@ class Directive:
             result.append(current_word)
             return result
 
-        rgx = f" *{cls.DIRECTIVE_IDENTIFIER} *(?P<directive_name>[a-zA-Z]+) *\((?P<parameters>[^\-\>]*)\) *({cls.DESCRIPTION_IDENTIFIER} *(?P<description>[^\\n]*))?"
-        match = re.search(rgx, line.strip())
+        match = cls.DIRECTIVE_PATTERN.search(line.strip())
         if not match:
             return
 
@@ -84,28 +94,110 @@ class Directive:
 
         return cls(directive_name, parameters, description, line_number, filename)
 
+    @property
+    def identifier(self) -> str:
+        """
+        The first parameter of the directive, identifying what it documents (e.g. a signature such as ``sudoku/3`` for a predicate, or a variable name).
+        """
+        return self.parameters[0].strip()
+
     @classmethod
-    def extract_directives(cls, file: List[str], filename: str) -> dict:
+    def extract_directives(cls, file: List[str], filename: str) -> DirectiveRegistry:
         """
         Extracts all of the directives from the file, returning a dictionary of lists of the extracted directives, with the keys being the names of the directives. If a directive with the same name and first parameter (correspond to an ID) already exists in the dictionary, the directive's description will be added to the existing directive if it is not already present.
 
-        :return: A dictionary of lists of the extracted directives, with the keys being the names of the directives.
+        :return: A DirectiveRegistry, i.e. a dictionary of lists of the extracted directives, with the keys being the names of the directives.
+        """
+        return cls.extract_directives_from_lines(enumerate(file), filename)
+
+    @classmethod
+    def extract_directives_from_comments(cls, comments: List[Comment], filename: str) -> DirectiveRegistry:
+        """
+        Same as :meth:`extract_directives`, but only on the comments of the file (directives are always written in comments), skipping the comments without directive.
+
+        :param comments: The comments of the file, see :meth:`Comment.extract_comments`.
+        :param filename: The filename of the file where the comments were found.
+        :return: A DirectiveRegistry, i.e. a dictionary of lists of the extracted directives, with the keys being the names of the directives.
+        """
+        lines = []
+        for comment in comments:
+            if cls.DIRECTIVE_IDENTIFIER in comment.content:
+                for idx, line in enumerate(comment.content.split('\n')):
+                    lines.append((comment.location.begin.line + idx, line))
+
+        return cls.extract_directives_from_lines(lines, filename)
+
+    @classmethod
+    def extract_directives_from_lines(cls, lines: Iterable[Tuple[int, str]], filename: str) -> DirectiveRegistry:
+        """
+        Same as :meth:`extract_directives`, but only on some lines of the file, given with their line number.
+
+        :param lines: An iterable of (line number, line) pairs.
+        :param filename: The filename of the file where the lines were found.
+        :return: A DirectiveRegistry, i.e. a dictionary of lists of the extracted directives, with the keys being the names of the directives.
         """
-        ret = {}
-        for line_number, line in enumerate(file):
+        ret = DirectiveRegistry()
+        for line_number, line in lines:
             directive = Directive.from_line(line, line_number, filename)
             if directive == None:
                 continue
 
-            if not directive.name in ret:
-                ret[directive.name] = [directive]
+            existing = ret.find(directive.name, directive.identifier)
+            if existing:
+                if not existing.description and directive.description:
+                    existing.description = directive.description
             else:
-                for t in ret[directive.name]:
-                    if t.parameters[0] == directive.parameters[0]:
-                        if not t.description and directive.description:
-                            t.description = directive.description
-                        break
-                else:
-                    ret[directive.name].append(directive)
+                ret.add(directive)
+
+        return ret
 
-        return ret
\ No newline at end of file
+
+class DirectiveRegistry(dict):
+    """
+    The directives of one or several files, as a dictionary of lists of directives keyed by directive name (in the order they were found).
+    The directives are also indexed by name and identifier (their first parameter), e.g. ``('predicate', 'sudoku/3')`` or ``('var', 'X')``, so that the directive documenting an element is found without scanning the lists.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.index: Dict[Tuple[str, str], List[Directive]] = {}
+
+    def add(self, directive: Directive) -> None:
+        """
+        Add a directive to the registry.
+
+        :param directive: The directive to add.
+        """
+        self.setdefault(directive.name, []).append(directive)
+        self.index.setdefault((directive.name, directive.identifier), []).append(directive)
+
+    def extend(self, other: DirectiveRegistry) -> None:
+        """
+        Add all the directives of another registry (e.g. of another file).
+
+        :param other: The registry to add.
+        """
+        for directives in other.values():
+            for directive in directives:
+                self.add(directive)
+
+    def get_all(self, name: str, identifier: str) -> List[Directive]:
+        """
+        Get every directive with the given name and identifier, there may be one for each file of the registry.
+
+        :param name: The name of the directives, e.g. ``predicate``.
+        :param identifier: The first parameter of the directives, e.g. ``sudoku/3``.
+        :return: A list of directives, possibly empty.
+        """
+        return self.index.get((name, identifier.strip()), [])
+
+    def find(self, name: str, identifier: str) -> Directive | None:
+        """
+        Get the first directive with the given name and identifier.
+
+        :param name: The name of the directive, e.g. ``var``.
+        :param identifier: The first parameter of the directive, e.g. ``X``.
+        :return: The directive, or None if there is none.
+        """
+        directives = self.get_all(name, identifier)
+        return directives[0] if directives else None
@@ -1,6 +1,9 @@
 from __future__ import annotations
-from typing import List, Dict, Tuple, Set
-from clingo.ast import AST, ASTSequence, ASTType, Location, Position
+from bisect import bisect_left
+from typing import List, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from clingo.ast import AST
 
 # Local import
 from .directive import Directive
@@ -14,11 +17,13 @@ class EnrichedAST:
     """
     The EnrichedAST (east) class provides additional information and functionality for analyzing and working with an Abstract Syntax Tree (AST) generated from a logic program. 
     This class takes as input a list of AST objects, the lines of the source file as a list of strings, the filename to the source file, and some parameters to configure it.
+    The AST lines of the included files are not computed by this class, they are shared from the EnrichedAST of the included files (see :meth:`link_includes`).
     
     :param ast_list: AST of the encoding as a list
     :param file: str list representing the file
     :param filename: location of the file
     :param parameters: documentation parameters 
+    :param includes: absolute filenames of the files included by this file
     """
 
     COMMENT_IDENTIFIER = "%-"
@@ -28,26 +33,43 @@ class EnrichedAST:
                  file: List[str],
                  filename: str,
                  parameters: Dict,
+                 includes: List[str] = [],
                  ) -> None:
 
         self.file = file
         self.filename = filename
         self.parameters = parameters
-        
-        self.directives = Directive.extract_directives(
-            self.file, self.filename)
+        self.includes = includes
         
         self.comments = Comment.extract_comments(file,filename)
 
-        self.symbols = Symbol.extract_symbols(
-            ast_list, self.directives.get('predicates'), filename)
-        
-        self.variables = Variable.extract_variables(
-            ast_list, self.directives.get('var'), filename)
-        
-        self.ast_lines, self.external_ast_lines = self.build_ast_lines(
-            ast_list)
+        self.directives = Directive.extract_directives_from_comments(
+            self.comments, self.filename)
+        self.build_indexes()
+
+        self.ast_lines = self.build_ast_lines(ast_list)
+        self.included_files = []
+        self.external_ast_lines = []
+
+    def link_includes(self, easts: Dict[str, EnrichedAST]) -> None:
+        """
+        Set the external AST lines (coming from an #include statement) from the already loaded EnrichedAST of the included files.
+        The includes are followed transitively, every file being taken once, and the included lines come before the lines of the file including them.
 
+        :param easts: The loaded EnrichedAST objects, by absolute filename.
+        """
+        closure = []
+        visited = {self.filename}
+        def visit(east: EnrichedAST):
+            for include in east.includes:
+                if include not in visited:
+                    visited.add(include)
+                    visit(easts[include])
+                    closure.append(easts[include])
+        visit(self)
+
+        self.included_files = [east.filename for east in closure]
+        self.external_ast_lines = [al for east in closure for al in east.ast_lines]
         
 
     # @classmethod
@@ -84,6 +106,18 @@ class EnrichedAST:
     #     comments.reverse()
     #     return comments
     
+    def build_indexes(self) -> None:
+        """
+        Index the comments and the section directives by line, so that the elements of a line can be found without scanning the whole file.
+        """
+        self.comment_index = {}
+        for comment in self.comments:
+            self.comment_index.setdefault(comment.location.begin.line, []).append(comment)
+
+        self.sections = sorted(self.directives.get('section', []), key=lambda directive: directive.line_number)
+        self.section_lines = [section.line_number for section in self.sections]
+        self._line_index = None
+
     def get_line(self,line:int):
         """
         Given a line number, returns every element at this line position
@@ -91,42 +125,24 @@ class EnrichedAST:
         :param line: line number where the elements needs to be retrieve
         :return: A list of element
         """
-        ret = []
-        all_elem = []
-        all_elem.extend(self.directives)
-        all_elem.extend(self.comments)
-        all_elem.extend(self.variables)
-        all_elem.extend(self.ast_lines)
-        
-        for elem in all_elem:
-            if elem.location.begin.line == line or elem.location.begin.line-1 == line :
-                ret.append(ret)
-                
-        return ret
-    
-    
+        if self._line_index is None:
+            # Built on the first call, once the AST lines are known
+            self._line_index = {}
+            all_elem = [(directive.line_number, directive) for directives in self.directives.values() for directive in directives]
+            all_elem.extend((elem.location.begin.line, elem) for elem in self.comments + self.get_variables() + self.ast_lines)
+            for elem_line, elem in all_elem:
+                self._line_index.setdefault(elem_line, []).append(elem)
+
+        return self._line_index.get(line, []) + self._line_index.get(line + 1, [])
 
     def get_comments(self, ast: AST) -> List[Comment]:
         """
-        Return a list of comments associated to the 
+        Return a list of comments associated to the given AST node.
 
         :param ast: The AST node for which to fetch comments.
-        :param file: A list of strings representing the lines of the logic program file.
         :return: A list of comments.
         """
-        ret = []
-        line_number = ast.location.begin.line
-        for comment in self.comments:
-            if line_number == comment.location.begin.line:
-                ret.append(comment)
-                        
-        return ret
-                        
-            
-            
-        
-        
-
+        return list(self.comment_index.get(ast.location.begin.line, []))
 
     def get_section(self, obj) -> Directive | None:
         """
@@ -137,80 +153,47 @@ class EnrichedAST:
         :return: The section Directive that the object belongs to, or None if no associated section directive is found.
         """
         line = obj.location.begin.line - 1
-        current_section = None
-        if self.directives.get('section'):
-            for section in sorted(self.directives['section'], key=lambda directive: directive.line_number):
-                if section.line_number < line:
-                    current_section = section
-                else:
-                    break
-        return current_section
-
-    def get_symbol(self, ast: ASTType.SymbolicAtom):
-        """
-        Given an AST symbolic atom, returns the Symbol object already computed that corresponds to it.
-        
-        :param ast: The AST symbolic atom to find the corresponding Symbol for.
-        :return: The Symbol object corresponding to the given AST symbolic atom, or None if no such symbol is found.
+        # The last section starting strictly before the line
+        idx = bisect_left(self.section_lines, line)
+        if idx:
+            return self.sections[idx - 1]
+        return None
+
+    def get_variables(self) -> List[Variable]:
         """
-        for symbol in self.symbols:
-            if ast.symbol.name == symbol.name and ast.symbol.location == symbol.location:
-                return symbol
+        Create the Variable objects of every variable occurrence of the file.
 
-        return Symbol(ast,None)
+        :return: A list of Variable objects, in the order of the file.
+        """
+        return [Variable(self.variables.get_name(idx), self.variables.get_location(idx), self.directives.find('var', self.variables.get_name(idx)))
+                for idx in range(len(self.variables))]
 
-    def build_ast_lines(self, ast_list: Tuple[List[AST], List[AST]]):
+    def build_ast_lines(self, ast_list: List[AST]) -> List[ASTLine]:
         """
         Builds the final AST lines, by extracting the symbols and dependencies from the given list of AST elements. 
-        This method will also filter the lines based on their file origin, and return the internal and external (coming from an #include statement) lines separately.
+        The symbols and the variables of the file are collected during the same traversal (see :class:`ASTVisitor`).
         
-        :param ast_list: A tuple of lists containing the internal and external AST elements.
-        :return: A tuple of lists containing the internal and external AST lines.
+        :param ast_list: A list containing the AST elements of the file.
+        :return: A list containing the AST lines.
         """
-        self.ast_lines = None
-        def deep_search_sym_dep(ast: AST, sym: Set, dep: Set, trace: List):
-            new_trace = trace.copy()
-            if isinstance(ast, ASTSequence):
-                new_trace.append('ASTSequence')
-                for _ast in ast:
-                    deep_search_sym_dep(_ast, sym, dep, new_trace)
-            else:
-                new_trace.append(ast.ast_type)
-                if ast.ast_type == ASTType.SymbolicAtom:
-                    if 'head' in new_trace:
-                        if 'head' in new_trace and ASTType.ConditionalLiteral in new_trace and 'condition' in new_trace:
-                            dep.add(self.get_symbol(ast))
-                        else:
-                            sym.add(self.get_symbol(ast))
-                    elif 'body':
-                        dep.add(self.get_symbol(ast))
-                    else:
-                        sym.add(self.get_symbol(ast))
-                else:
-                    if ast.child_keys:
-                        for child in ast.child_keys:
-                            a = eval(f'ast.{child}')
-                            if a:
-                                new_trace.append(child)
-                                deep_search_sym_dep(
-                                    a, sym, dep, new_trace)
-                                new_trace.remove(child)
-                return (sym, dep)
+        from .visitor import ASTVisitor
 
+        visitor = ASTVisitor(self.directives, self.filename)
         ast_lines = []
-        external_ast_lines = []
 
         for ast in ast_list:
-            syms, dependencies = deep_search_sym_dep(ast, set(), set(), [])
+            syms, positive, negative = visitor.visit(ast)
+            dependencies = positive | negative if negative else positive
             al = ASTLine.factory(ast, syms, dependencies,
                                  section=self.get_section(ast),
                                  comments=self.get_comments(ast),
                                  src_dir=self.parameters['src_dir'])
             
             if al:
-                if al.location.begin.filename == self.filename:
-                    ast_lines.append(al)
-                else:
-                    external_ast_lines.append(al)
+                if negative:
+                    al.positive_dependencies = positive
+                    al.negative_dependencies = negative
+                ast_lines.append(al)
 
-        return ast_lines, external_ast_lines
+        self.variables = visitor.variables
+        return ast_lines
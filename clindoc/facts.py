@@ -0,0 +1,235 @@
+from __future__ import annotations
+from fnmatch import fnmatch
+from typing import Dict, List, Set, Tuple
+import os
+import re
+
+from .east import EnrichedAST
+from .directive import Directive
+from .occurrence import OccurrenceStore
+
+
+class FactFile(EnrichedAST):
+    """
+    A data file made only of facts (e.g. an instance), summarized per signature instead of being parsed by clingo.
+    The file is read by chunks and lexed without building any AST: only the number of fact statements of each signature and a bounded sample of them are kept in memory.
+    It has no AST lines, symbols or variables (its facts are then not part of the dependency graphs), but the directives written in its comments are extracted.
+
+    A file is tried as a fact file if it matches one of the `fact_files` patterns, or if it is bigger than `fact_file_size` bytes.
+
+    :param filename: location of the file
+    :param parameters: documentation parameters
+    :param signatures: the number of fact statements of each signature, a statement with an interval or a pool being counted once per signature
+    :param samples: the first fact statements of each signature, as written in the file
+    :param directives: the directives found in the comments of the file
+    :param line_count: the number of lines of the file
+    """
+
+    CHUNK_SIZE = 1 << 20
+
+    # Leading spaces are part of the tokens, to match each fact with a single call
+    TOKEN_PATTERN = re.compile(r"""
+          \s*(?:
+              (?P<block>%\*.*?\*%)
+            | (?P<comment>%(?!\*)[^\n]*)
+            | (?P<fact>(?P<name>-?_*[a-z][\w']*)[ \t]*(?:\((?P<arguments>[^()"%.]*(?:\.\.[^()"%.]*)*)\))?[ \t]*\.(?!\.))
+          )
+        | (?P<space>\s+)
+        """, re.DOTALL | re.VERBOSE)
+    NAME_PATTERN = re.compile(r"-?_*[a-z][\w']*")
+    VARIABLE_PATTERN = re.compile(r"(?<![\w'])(?:_*[A-Z]|_(?![\w']))")
+
+    # Returned by _scan_statement when the statement goes beyond the scanned text
+    INCOMPLETE = 'incomplete'
+
+    def __init__(self,
+                 filename: str,
+                 parameters: Dict,
+                 signatures: Dict[str, int],
+                 samples: Dict[str, List[str]],
+                 directives: Dict,
+                 line_count: int) -> None:
+
+        self.file = []
+        self.filename = filename
+        self.parameters = parameters
+        self.includes = []
+        self.signatures = signatures
+        self.samples = samples
+        self.line_count = line_count
+
+        self.directives = directives
+        self.comments = []
+        self.variables = OccurrenceStore(filename)
+        self.ast_lines = []
+        self.included_files = []
+        self.external_ast_lines = []
+        self.build_indexes()
+
+    @classmethod
+    def matches_patterns(cls, filename: str, parameters: Dict) -> bool:
+        """
+        Tell if the given file matches one of the `fact_files` patterns (relatively to src_dir).
+
+        :param filename: The filename of the file.
+        :param parameters: A dictionary of parameters for the Clindoc object.
+        """
+        relative_filename = os.path.relpath(filename, parameters['src_dir'])
+        return any(fnmatch(relative_filename, pattern) for pattern in parameters.get('fact_files') or [])
+
+    @classmethod
+    def is_candidate(cls, filename: str, parameters: Dict) -> bool:
+        """
+        Tell if the given file should be tried as a fact file.
+
+        :param filename: The filename of the file.
+        :param parameters: A dictionary of parameters for the Clindoc object.
+        """
+        if cls.matches_patterns(filename, parameters):
+            return True
+
+        size = parameters.get('fact_file_size')
+        return bool(size) and os.path.getsize(filename) >= size
+
+    @classmethod
+    def from_file(cls, filename: str, parameters: Dict) -> FactFile | None:
+        """
+        Lex the given file by chunks and summarize its facts.
+
+        :param filename: The filename of the file.
+        :param parameters: A dictionary of parameters for the Clindoc object.
+        :return: A FactFile object, or None as soon as a statement that is not a fact is found.
+        """
+        signatures = {}
+        samples = {}
+        directive_lines = []
+        sample_size = parameters.get('fact_sample', 5)
+
+        line = 0
+        buffer = ''
+        with open(filename) as f:
+            eof = False
+            while not eof:
+                chunk = f.read(cls.CHUNK_SIZE)
+                eof = not chunk
+                buffer += chunk
+                # Statements are rarely split on several lines, lexing up to the last line break avoids most of the cut statements
+                limit = len(buffer) if eof else buffer.rfind('\n') + 1
+
+                pos = 0
+                counted = 0
+                while pos < limit:
+                    match = cls.TOKEN_PATTERN.match(buffer, pos, limit)
+                    if match is None:
+                        while buffer[pos].isspace():
+                            pos += 1
+                        statement = cls._scan_statement(buffer, pos, limit)
+                        if statement == cls.INCOMPLETE and not eof:
+                            break
+                        if statement is None or statement == cls.INCOMPLETE:
+                            return None
+                        end, name, arities = statement
+                        text = buffer[pos:end]
+                    elif match.lastgroup == 'fact':
+                        end = match.end()
+                        name = match['name']
+                        arguments = match['arguments']
+                        if arguments is None:
+                            arities = {0}
+                        elif cls.VARIABLE_PATTERN.search(arguments):
+                            return None
+                        else:
+                            # Each alternative of a pool is a tuple of arguments, e.g. p(1;2,3) gives p(1) and p(2,3)
+                            arities = {alternative.count(',') + 1 if alternative.strip() else 0 for alternative in arguments.split(';')}
+                        text = match[0]
+                    else:
+                        end = match.end()
+                        if match.lastgroup != 'space' and '@' in match[match.lastgroup]:
+                            line += buffer.count('\n', counted, match.start(match.lastgroup))
+                            counted = match.start(match.lastgroup)
+                            for idx, comment_line in enumerate(match[match.lastgroup].split('\n')):
+                                directive_lines.append((line + idx, comment_line))
+                        pos = end
+                        continue
+
+                    for arity in sorted(arities):
+                        signature = f"{name}/{arity}"
+                        if signature in signatures:
+                            signatures[signature] += 1
+                            if len(samples[signature]) < sample_size:
+                                samples[signature].append(text.strip())
+                        else:
+                            signatures[signature] = 1
+                            samples[signature] = [text.strip()] if sample_size else []
+                    pos = end
+
+                line += buffer.count('\n', counted, pos)
+                buffer = buffer[pos:]
+
+        directives = Directive.extract_directives_from_lines(directive_lines, filename)
+
+        return cls(filename, parameters, signatures, samples, directives, line + 1)
+
+    @classmethod
+    def _scan_statement(cls, buffer: str, pos: int, limit: int) -> Tuple[int, str, Set[int]] | str | None:
+        """
+        Scan a fact character by character, for the facts that are too complex for TOKEN_PATTERN (nested terms, strings...).
+
+        :return: The end position, name and arities of the fact (one per alternative of a pool), None if the statement is not a fact, or INCOMPLETE if it goes beyond limit.
+        """
+        match = cls.NAME_PATTERN.match(buffer, pos, limit)
+        if not match:
+            # An unterminated block comment, or anything that is not a fact
+            return cls.INCOMPLETE if buffer.startswith('%*', pos) else None
+
+        name = match[0]
+        arities = {0}
+        i = match.end()
+        while i < limit and buffer[i].isspace():
+            i += 1
+
+        if i < limit and buffer[i] == '(':
+            # Start of the current alternative of the pool
+            start = i + 1
+            depth = 0
+            arity = 1
+            arities = set()
+            while True:
+                if i >= limit:
+                    return cls.INCOMPLETE
+                c = buffer[i]
+                if c == '"':
+                    i += 1
+                    while i < limit and buffer[i] != '"':
+                        i += 2 if buffer[i] == '\\' else 1
+                    if i >= limit:
+                        return cls.INCOMPLETE
+                elif c == '(':
+                    depth += 1
+                elif c == ')' or (c == ';' and depth == 1):
+                    if depth == 1:
+                        arities.add(arity if buffer[start:i].strip() else 0)
+                        start = i + 1
+                        arity = 1
+                    if c == ')':
+                        depth -= 1
+                        if depth == 0:
+                            i += 1
+                            break
+                elif c == ',' and depth == 1:
+                    arity += 1
+                elif c == '%':
+                    return None
+                elif cls.VARIABLE_PATTERN.match(buffer, i):
+                    return None
+                i += 1
+
+            while i < limit and buffer[i].isspace():
+                i += 1
+
+        if i >= limit:
+            return cls.INCOMPLETE
+        if buffer[i] != '.' or buffer.startswith('..', i):
+            return None
+
+        return i + 1, name, arities
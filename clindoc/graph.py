@@ -0,0 +1,91 @@
+from __future__ import annotations
+from typing import Iterable, List, Set, Tuple
+
+
+def successors(n: int, edges: Iterable[Tuple[int, int]]) -> List[List[int]]:
+    """
+    A helper function to get the adjacency lists of a directed graph.
+
+    :param n: The number of nodes, numbered from 0 to n-1.
+    :param edges: The edges, as pairs of nodes.
+    :return: The successors of each node.
+    """
+    ret = [[] for _ in range(n)]
+    for a, b in edges:
+        ret[a].append(b)
+    return ret
+
+
+def strongly_connected_components(n: int, edges: Iterable[Tuple[int, int]]) -> List[int]:
+    """
+    A helper function to compute the strongly connected components of a directed graph, with Tarjan's algorithm.
+    The algorithm is iterative, so that long dependency chains do not hit the recursion limit.
+
+    :param n: The number of nodes, numbered from 0 to n-1.
+    :param edges: The edges, as pairs of nodes.
+    :return: The component of each node. Components are numbered in reverse topological order: if a node of component i has an edge to a node of component j, then i >= j.
+    """
+    succ = successors(n, edges)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    component = [-1] * n
+    stack = []
+    count = 0
+    components = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        # Each frame is a node and the position of the next successor to visit
+        frames = [(root, 0)]
+        while frames:
+            node, i = frames.pop()
+            if i == 0:
+                index[node] = low[node] = count
+                count += 1
+                stack.append(node)
+                on_stack[node] = True
+
+            if i < len(succ[node]):
+                frames.append((node, i + 1))
+                child = succ[node][i]
+                if index[child] == -1:
+                    frames.append((child, 0))
+                elif on_stack[child]:
+                    low[node] = min(low[node], index[child])
+                continue
+
+            if low[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component[member] = components
+                    if member == node:
+                        break
+                components += 1
+
+            if frames:
+                parent = frames[-1][0]
+                low[parent] = min(low[parent], low[node])
+
+    return component
+
+
+def induced_subgraph(succ: List[List[int]], nodes: List[int]) -> Set[Tuple[int, int]]:
+    """
+    A helper function to get the edges of the subgraph induced by some nodes, i.e. the edges of the graph between two of these nodes.
+    Only the successors of the given nodes are visited, not the whole graph.
+
+    :param succ: The successors of each node of the graph.
+    :param nodes: The nodes of the subgraph.
+    :return: The edges of the subgraph, as pairs of positions in nodes.
+    """
+    position = {node: i for i, node in enumerate(nodes)}
+    edges = set()
+    for i, node in enumerate(nodes):
+        for child in succ[node]:
+            j = position.get(child)
+            if j is not None:
+                edges.add((i, j))
+    return edges
@@ -0,0 +1,78 @@
+from __future__ import annotations
+from array import array
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from clingo.ast import Location
+
+
+class OccurrenceStore:
+    """
+    The occurrences of the variables of a file, stored column-wise in integer arrays instead of one object per occurrence.
+    Each file has its own store, so there is no file column; the symbols are not stored, a single Symbol being shared by the occurrences of a signature (see :class:`ASTVisitor`).
+    Names are interned: each distinct name is stored once in `names`, and the occurrences refer to it by its index.
+    The Variable objects used by the builders are created on demand from the columns.
+
+    :param filename: The filename of the file of the occurrences.
+    """
+
+    __slots__ = ('filename', 'names', 'name_ids', 'name', 'line', 'column', 'end_line', 'end_column')
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self.names: List[str] = []
+        self.name_ids: Dict[str, int] = {}
+
+        # One entry per occurrence in each column
+        self.name = array('i')
+        self.line = array('i')
+        self.column = array('i')
+        self.end_line = array('i')
+        self.end_column = array('i')
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def intern(self, name: str) -> int:
+        """
+        Get the id of a name, adding it to the names if needed.
+
+        :param name: The name.
+        :return: The index of the name in `names`.
+        """
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.names.append(name)
+            self.name_ids[name] = name_id
+        return name_id
+
+    def add(self, name: str, location: Location) -> None:
+        """
+        Add an occurrence.
+
+        :param name: The name of the occurrence.
+        :param location: The location of the occurrence.
+        """
+        self.name.append(self.intern(name))
+        self.line.append(location.begin.line)
+        self.column.append(location.begin.column)
+        self.end_line.append(location.end.line)
+        self.end_column.append(location.end.column)
+
+    def get_name(self, idx: int) -> str:
+        """
+        :param idx: The index of an occurrence.
+        :return: The name of the occurrence.
+        """
+        return self.names[self.name[idx]]
+
+    def get_location(self, idx: int) -> Location:
+        """
+        :param idx: The index of an occurrence.
+        :return: The location of the occurrence, as a clingo Location.
+        """
+        from clingo.ast import Location, Position
+
+        return Location(Position(self.filename, self.line[idx], self.column[idx]),
+                        Position(self.filename, self.end_line[idx], self.end_column[idx]))
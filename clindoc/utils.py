@@ -1,7 +1,10 @@
+from __future__ import annotations
 import os
 
-from clingo.ast import Location
-from typing import Dict, List
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from clingo.ast import Location
 
 def get_dir_filename(filename:str) -> str:
     """
@@ -21,9 +24,48 @@ def create_dir(filename:str) -> None:
     :param filename: The filename of the directory to create.
     :return: None
     """
-    if not os.path.exists(filename):
-        os.makedirs(filename)
+    # Components are built concurrently, the directory may be created by another one meanwhile
+    os.makedirs(filename, exist_ok=True)
          
+def write_if_changed(filename:str, content:str) -> bool:
+    """
+    A helper function to write a file only if its content changed.
+    An unchanged file keeps its modification time, so Sphinx does not read it (and the pages using it) again.
+
+    :param filename: The filename of the file.
+    :param content: The content of the file.
+    :return: True if the file was written.
+    """
+    try:
+        with open(filename) as file:
+            if file.read() == content:
+                return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+
+    with open(filename, 'w') as file:
+        file.write(content)
+    return True
+
+
+def replace_if_changed(tmp_filename:str, filename:str) -> bool:
+    """
+    A helper function to move a newly generated file to its filename, unless a file with the same content is already there.
+    The new file is removed in both cases.
+
+    :param tmp_filename: The filename of the new file.
+    :param filename: The filename of the file to replace.
+    :return: True if the file was replaced.
+    """
+    import filecmp
+
+    if os.path.exists(filename) and filecmp.cmp(tmp_filename, filename, shallow=False):
+        os.remove(tmp_filename)
+        return False
+    os.replace(tmp_filename, filename)
+    return True
+
+
 def filename_from_source(source:str,filename:str)->str:
     """
     A helper function to get the relative filename of a file from a source folder.
@@ -85,11 +127,6 @@ def parse_content_from_location(file:List[str], location:Location) -> str:
     else:
         parsed_list = [file[location.begin.line]]
         parsed_list[0] = parsed_list[0][location.begin.column:location.end.column]
-        
-    
-    ret = ""
-    for l in parsed_list:
-        ret += l
-    
-    return ret
+
+    return ''.join(parsed_list)
     
\ No newline at end of file
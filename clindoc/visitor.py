@@ -0,0 +1,89 @@
+from __future__ import annotations
+from typing import Dict, List, Set, Tuple
+from clingo.ast import AST, ASTSequence, ASTType, Sign
+
+from .directive import DirectiveRegistry
+from .occurrence import OccurrenceStore
+from .symbol import Symbol
+
+
+class ASTVisitor:
+    """
+    Walks the statements of a file and collects, in a single traversal, the occurrences of the variables they contain, and which symbols each statement defines or depends on.
+    The traversal is iterative (with an explicit stack), so deeply nested terms do not hit the recursion limit.
+    The occurrences of the variables are added to an OccurrenceStore, and a single Symbol is created for each signature of the file.
+
+    A symbolic atom is defined by a statement if it appears in its head, except in the condition of a conditional literal. Every other symbolic atom is a dependency.
+    A dependency is negative if the atom appears in a negated literal (``not`` or ``not not``, possibly around an aggregate), positive otherwise.
+
+    :param directives: The directives of the file, giving the predicate directives of the symbols.
+    :param filename: The filename of the file.
+    """
+
+    # Context flags of a node, set if one of its ancestors is in the head, a conditional literal, a condition or a negated literal
+    HEAD = 1
+    CONDITIONAL_LITERAL = 2
+    CONDITION = 4
+    NEGATION = 8
+
+    def __init__(self, directives: DirectiveRegistry, filename: str) -> None:
+        self.directives = directives
+        self.variables = OccurrenceStore(filename)
+        self.signatures: Dict[str, Symbol] = {}
+
+    def visit(self, statement: AST) -> Tuple[Set[Symbol], Set[Symbol], Set[Symbol]]:
+        """
+        Visit a statement, the occurrences of variables found are added to `variables`.
+
+        :param statement: The AST of the statement.
+        :return: The symbols defined by the statement, the symbols it depends on positively, and the symbols it depends on negatively. A symbol occurring both ways is in both sets.
+        """
+        define = set()
+        positive = set()
+        negative = set()
+
+        # Children are pushed in reverse order, so the nodes are visited in the order of the file
+        stack: List[Tuple[AST, int]] = [(statement, 0)]
+        while stack:
+            ast, context = stack.pop()
+            ast_type = ast.ast_type
+
+            if ast_type == ASTType.SymbolicAtom:
+                name, arguments = Symbol.unpack(ast.symbol)
+                signature = f"{name}/{len(arguments)}"
+                symbol = self.signatures.get(signature)
+                if symbol is None:
+                    symbol = Symbol(name, len(arguments), ast.symbol.location, self.directives.find('predicate', signature))
+                    self.signatures[signature] = symbol
+                if context & self.HEAD and not (context & self.CONDITIONAL_LITERAL and context & self.CONDITION):
+                    define.add(symbol)
+                elif context & self.NEGATION:
+                    negative.add(symbol)
+                else:
+                    positive.add(symbol)
+            elif ast_type == ASTType.Variable:
+                self.variables.add(ast.name, ast.location)
+                continue
+            elif ast_type == ASTType.ConditionalLiteral:
+                context |= self.CONDITIONAL_LITERAL
+            elif ast_type == ASTType.Literal and ast.sign != Sign.NoSign:
+                context |= self.NEGATION
+
+            children = []
+            for key in ast.child_keys:
+                child = getattr(ast, key)
+                if not child:
+                    continue
+                child_context = context
+                if key == 'head':
+                    child_context |= self.HEAD
+                elif key == 'condition':
+                    child_context |= self.CONDITION
+
+                if isinstance(child, ASTSequence):
+                    children.extend((c, child_context) for c in child)
+                else:
+                    children.append((child, child_context))
+            stack.extend(reversed(children))
+
+        return define, positive, negative
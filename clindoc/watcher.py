@@ -0,0 +1,81 @@
+from __future__ import annotations
+from typing import Dict, Set, Tuple
+import os
+import queue
+import time
+
+
+class Watcher:
+    """
+    Watches the .lp files of a folder (recursively) and reports the files that were modified, added or removed.
+    It relies on inotify (through the optional `watchdog` package) when it is available, and falls back to polling the modification times otherwise.
+
+    :param src_dir: The folder to watch.
+    :param interval: Time in seconds between two polls, also used to gather the events of a single save.
+    """
+
+    def __init__(self, src_dir: str, interval: float = 1.0) -> None:
+        self.src_dir = src_dir
+        self.interval = interval
+        self._events = None
+        self._snapshot = self._take_snapshot()
+
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            return
+
+        events = queue.Queue()
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if not event.is_directory:
+                    events.put(event)
+
+        self._observer = Observer()
+        self._observer.schedule(Handler(), src_dir, recursive=True)
+        self._observer.daemon = True
+        self._observer.start()
+        self._events = events
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for root, dirs, files in os.walk(self.src_dir):
+            for f in files:
+                if f.endswith('.lp'):
+                    filename = os.path.join(root, f)
+                    try:
+                        stat = os.stat(filename)
+                    except OSError:
+                        continue
+                    snapshot[filename] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _diff_snapshot(self) -> Set[str]:
+        snapshot = self._take_snapshot()
+        changed = {f for f in snapshot.keys() | self._snapshot.keys()
+                   if snapshot.get(f) != self._snapshot.get(f)}
+        self._snapshot = snapshot
+        return changed
+
+    def wait(self) -> Set[str]:
+        """
+        Block until at least one .lp file changed.
+
+        :return: The filenames of the modified, added or removed files.
+        """
+        while True:
+            if self._events is None:
+                time.sleep(self.interval)
+            else:
+                self._events.get()
+                # Editors usually write a file in several steps, wait for the save to settle
+                time.sleep(self.interval)
+                while not self._events.empty():
+                    self._events.get_nowait()
+
+            # Events are only used as a trigger, the snapshot tells what actually changed
+            changed = self._diff_snapshot()
+            if changed:
+                return changed
@@ -88,3 +88,78 @@ c.build_documentation()
 print()
 
 # %%
+# %% Test 12 - Including a file outside of src_dir
+import os
+import tempfile
+from clindoc import Clindoc
+
+print("Test 12 - Including a file outside of src_dir")
+with tempfile.TemporaryDirectory() as tmp:
+    os.makedirs(os.path.join(tmp, 'src'))
+    os.makedirs(os.path.join(tmp, 'lib'))
+    with open(os.path.join(tmp, 'src', 'a.lp'), 'w') as file:
+        file.write('#include "../lib/b.lp".\nout(X) :- step(X).\n')
+    with open(os.path.join(tmp, 'lib', 'b.lp'), 'w') as file:
+        file.write('base(1..3).\nstep(X) :- base(X).\n')
+    c = Clindoc({'src_dir': os.path.join(tmp, 'src'), 'no_sphinx_build': True})
+    c.build_documentation()
+    # The rules of the included file are part of the rule dependency graph of the including file
+    with open(os.path.join(tmp, 'src', 'docs', 'img', 'a', 'rdg.dot')) as file:
+        dot = file.read()
+    assert '"base/1; l1" -> "step/1; l2"' in dot and '"step/1; l2" -> "out/1; l2"' in dot, dot
+print()
+# %% Test 13 - Include statements in comments, strings and after other statements
+import os
+import tempfile
+from clindoc import Clindoc
+
+print("Test 13 - Include statements in comments, strings and after other statements")
+with tempfile.TemporaryDirectory() as tmp:
+    with open(os.path.join(tmp, 'b.lp'), 'w') as file:
+        file.write('r.\n')
+    content = 'p(1). #include "b.lp".\n%* #include "old.lp". *%\nq :- r, s("#include \\"x.lp\\".").\n% #include "gone.lp".\n'
+    _, _, includes = Clindoc.parse_program(os.path.join(tmp, 'a.lp'), content)
+    assert includes == [os.path.join(tmp, 'b.lp')], includes
+print()
+# %% Test 14 - Signatures of the facts of a data file with pools
+import os
+import tempfile
+from clindoc.facts import FactFile
+
+print("Test 14 - Signatures of the facts of a data file with pools")
+with tempfile.TemporaryDirectory() as tmp:
+    with open(os.path.join(tmp, 'data.lp'), 'w') as file:
+        # Each alternative of a pool is a tuple of arguments, the second fact needs the character scanner
+        file.write('-r(1;2,3).\ns(f(1;2),"a;b";3).\nt().\n')
+    fact_file = FactFile.from_file(os.path.join(tmp, 'data.lp'), {'src_dir': tmp})
+    assert fact_file.signatures == {'-r/1': 1, '-r/2': 1, 's/2': 1, 's/1': 1, 't/0': 1}, fact_file.signatures
+print()
+# %% Test 15 - Impact analysis of an included file outside of src_dir
+import os
+import tempfile
+from clindoc import Clindoc
+
+print("Test 15 - Impact analysis of an included file outside of src_dir")
+with tempfile.TemporaryDirectory() as tmp:
+    os.makedirs(os.path.join(tmp, 'src'))
+    os.makedirs(os.path.join(tmp, 'lib'))
+    with open(os.path.join(tmp, 'src', 'a.lp'), 'w') as file:
+        file.write('#include "../lib/b.lp".\nout(X) :- step(X).\n')
+    with open(os.path.join(tmp, 'lib', 'b.lp'), 'w') as file:
+        file.write('#defined base/1.\nstep(X) :- base(X).\n#show done(X) : step(X).\n')
+    c = Clindoc({'src_dir': os.path.join(tmp, 'src'), 'no_sphinx_build': True})
+    c.build_documentation()
+    # The input and the output of the included file are in the impact tables
+    with open(os.path.join(tmp, 'src', 'docs', 'contributordoc.rst')) as file:
+        rows = [[cell.strip() for cell in line.split('|')[1:-1]] for line in file if line.startswith('|')]
+    assert ['base/1', 'done/1'] in rows, rows
+print()
+# %% Test 16 - Lines of a file with other line break characters than '\n'
+from clindoc import Clindoc
+
+print("Test 16 - Lines of a file with other line break characters than '\\n'")
+lines, ast_list, _ = Clindoc.parse_program('a.lp', '%- page\x0cbreak\na("\x85\u2028").\nc :- a(_).\n')
+assert lines == ['%- page\x0cbreak\n', 'a("\x85\u2028").\n', 'c :- a(_).\n'], lines
+# The rows of the lines are the rows of the clingo locations
+assert lines[ast_list[-1].location.begin.line - 1].startswith('c :- a(_).'), lines
+print()